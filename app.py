@@ -1,5 +1,7 @@
 import streamlit as st
 
+from npi.sites import TRACKERS
+
 st.set_page_config(page_title="NPI Dashboard", layout="wide")
 
 # Custom CSS for larger vertical buttons
@@ -59,23 +61,13 @@ st.markdown("""
 st.markdown('<h1 class="main-header">🚀 NPI DASHBOARD</h1>', unsafe_allow_html=True)
 st.markdown('<p class="sub-header">Select a tracker to get started</p>', unsafe_allow_html=True)
 
-# Three large vertical buttons (no visual cards)
-col1, col2, col3 = st.columns(3)
-
-with col1:
-    if st.button("📋 UTAH NA ", key="utah_btn", use_container_width=True, type="primary"):
-        st.switch_page("pages/1_UTAH_NA.py")
-
-with col2:
-    if st.button("🎯 Milestone Tracker Dashboard", key="milestone_btn", use_container_width=True, type="primary"):
-        st.switch_page("pages/2_Milestone_Tracker.py")
-
-
-with col3:
-    if st.button(" 📋 DALLAS NA ", key="dallas_btn", use_container_width=True, type="primary"):
-        st.switch_page("pages/3_DALLAS_NA.py")
-
+# One large vertical button per tracker (npi.sites), no visual cards
+for col, (tracker_id, t) in zip(st.columns(len(TRACKERS)), TRACKERS.items()):
+    with col:
+        if st.button(t["button"], key=f"{tracker_id}_btn", use_container_width=True, type="primary"):
+            st.switch_page(t["page"])
 
+st.page_link("pages/4_Portfolio_Overview.py", label="📊 Portfolio overview: every tracker on one page")
 
 # Footer
 st.markdown("""
@@ -0,0 +1,316 @@
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+# Fresh on-disk cache for the run, so sessions start cold like a new server
+os.environ.setdefault("NPI_CACHE_DIR", tempfile.mkdtemp(prefix="npi-load-"))
+
+import streamlit as st  # noqa: E402
+from streamlit.runtime import Runtime  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from benchmarks.synthetic import SHEETS  # noqa: E402
+from npi import metrics  # noqa: E402
+from npi.mockserver import MockSheetServer, load_recordings  # noqa: E402
+from npi.sites import TRACKERS  # noqa: E402
+from npi.sources import all_sources  # noqa: E402
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# --------------------- LOAD TEST ---------------------
+# How many displays can one server carry? Runs each entry script under N
+# concurrent headless sessions (streamlit.testing AppTest, one thread each)
+# against npi.mockserver, so nothing touches the real sheets. Every session:
+#   load      first run of the script
+#   widget    picks a random option in a random selectbox and reruns
+#   refresh   all sessions meet at a barrier, the sources are expired (and
+#             the mock sheets moved to their next version with --change), then
+#             every session reruns, as the auto-refresh tick would
+# for --cycles rounds of widget + refresh.
+#
+# Per script it records rerun latency percentiles per kind, peak threads,
+# process RSS, upstream requests (mock server hits) and the npi.metrics
+# counters (source / derive / fragment / export hits and misses), also per
+# session. Everything goes to a JSON file; --baseline compares p95 latency and
+# requests per session with an earlier run (exit 1 on regressions).
+#
+#   python -m benchmarks.load --sessions 20 --cycles 3 --out load.json
+#   python -m benchmarks.load --recordings recordings/ --latency 0.5 --change
+#   python -m benchmarks.load --scripts simple.py --baseline load.json
+
+PARSERS = {"readiness": "readiness", "milestone": "milestone", "submilestones": "dallas"}
+KINDS = ("load", "widget", "refresh")
+
+
+def _share_test_runtime():
+    # AppTest installs a mock Runtime for the length of one run and clears it
+    # afterwards. With several sessions in flight, one session finishing would
+    # pull it out from under the others, so keep handing out the last one.
+    original = Runtime.__dict__["instance"].__func__
+    last = []
+
+    def instance(cls):
+        if cls._instance is not None:
+            last[:] = [cls._instance]
+        elif last:
+            return last[0]
+        return original(cls)
+    Runtime.instance = classmethod(instance)
+    # Session threads are not script threads; that is expected here
+    logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").addFilter(
+        lambda record: "missing ScriptRunContext" not in record.getMessage())
+
+
+def default_scripts():
+    return ["simple.py"] + sorted(str(p.relative_to(ROOT)) for p in (ROOT / "pages").glob("*.py"))
+
+
+def synthetic_sheets(rows, versions=2):
+    # Each tracker's synthetic sheet, one version per seed
+    return {tracker_id: [SHEETS[PARSERS[t["type"]]](rows, seed) for seed in range(versions)]
+            for tracker_id, t in TRACKERS.items()}
+
+
+def _quantiles(values):
+    if not values:
+        return {}
+    values = sorted(values)
+
+    def q(p):
+        return values[min(len(values) - 1, int(p * len(values)))]
+    return {"count": len(values), "p50_s": q(0.5), "p90_s": q(0.9), "p95_s": q(0.95), "p99_s": q(0.99),
+            "max_s": values[-1], "mean_s": statistics.fmean(values)}
+
+
+def _rss_mb():
+    # Current resident set; peak (ru_maxrss) where /proc is not available
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except (OSError, ValueError, AttributeError):
+        if resource is None:
+            return None
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2 ** 20 if sys.platform == "darwin" else peak / 2 ** 10
+
+
+class Monitor:
+    # Samples thread count and RSS in the background while a script runs
+    def __init__(self, every=0.05):
+        self.every = every
+        self.threads = []
+        self.rss = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="load monitor", daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.threads.append(threading.active_count())
+            rss = _rss_mb()
+            if rss is not None:
+                self.rss.append(rss)
+            self._stop.wait(self.every)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def _counters():
+    totals = {}
+    for c in metrics.snapshot()["counters"]:
+        totals[c["name"]] = totals.get(c["name"], 0) + c["value"]
+    return totals
+
+
+def _session(script, cycles, seed, barrier, timeout, record):
+    rng = random.Random(seed)
+
+    def timed(kind, run):
+        start = time.perf_counter()
+        at = run()
+        record(kind, time.perf_counter() - start, len(at.exception))
+        return at
+
+    at = AppTest.from_file(str(ROOT / script), default_timeout=timeout)
+    try:
+        timed("load", at.run)
+        for _ in range(cycles):
+            boxes = [b for b in at.selectbox if len(b.options) > 1]
+            if boxes:
+                box = rng.choice(boxes)
+                timed("widget", box.select_index(rng.randrange(len(box.options))).run)
+            barrier.wait()
+            timed("refresh", at.run)
+    except threading.BrokenBarrierError:
+        pass
+    except Exception:
+        # Let the other sessions through the barrier instead of hanging them
+        barrier.abort()
+        raise
+
+
+def run_script(script, server, sessions, cycles, change, timeout, seed):
+    latencies = {kind: [] for kind in KINDS}
+    failures = []
+    lock = threading.Lock()
+
+    def record(kind, seconds, exceptions):
+        with lock:
+            latencies[kind].append(seconds)
+            if exceptions:
+                failures.append(kind)
+
+    def tick():
+        # One auto-refresh window passes for everyone
+        for src in all_sources():
+            src.expire()
+        if change:
+            for name in server.sheets:
+                server.advance(name)
+
+    barrier = threading.Barrier(sessions, action=tick)
+    errors = []
+
+    def worker(i):
+        try:
+            _session(script, cycles, seed + i, barrier, timeout, record)
+        except Exception as e:
+            with lock:
+                errors.append(f"{type(e).__name__}: {e}")
+
+    hits_before = sum(server.hits.values())
+    counters_before = _counters()
+    threads_before = threading.active_count()
+    rss_before = _rss_mb()
+    start = time.perf_counter()
+    with Monitor() as monitor:
+        workers = [threading.Thread(target=worker, args=(i,), name=f"session {i}") for i in range(sessions)]
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+    wall = time.perf_counter() - start
+
+    requests = sum(server.hits.values()) - hits_before
+    counters = {name: value - counters_before.get(name, 0) for name, value in _counters().items()}
+    counters = {name: value for name, value in counters.items() if value}
+    peak_rss = max(monitor.rss, default=None)
+    reruns = sum(len(v) for v in latencies.values())
+    return {
+        "script": script, "sessions": sessions, "cycles": cycles, "wall_s": wall,
+        "reruns": reruns, "reruns_per_s": reruns / wall if wall else None,
+        "latency": {kind: _quantiles(v) for kind, v in latencies.items() if v},
+        "threads_before": threads_before, "peak_threads": max(monitor.threads, default=threads_before),
+        "rss_before_mb": rss_before, "peak_rss_mb": peak_rss,
+        "rss_per_session_mb": (peak_rss - rss_before) / sessions if peak_rss and rss_before else None,
+        "upstream_requests": requests, "requests_per_session": requests / sessions,
+        "counters": counters, "failed_reruns": len(failures), "errors": errors,
+    }
+
+
+def compare(results, baseline, tolerance):
+    # Scripts whose p95 rerun latency or upstream requests per session grew by
+    # more than tolerance (0.25 = 25%)
+    before = {(r["script"], r["sessions"]): r for r in baseline["results"]}
+    worse = []
+    for r in results:
+        old = before.get((r["script"], r["sessions"]))
+        if old is None:
+            continue
+        for kind, lat in r["latency"].items():
+            old_p95 = old["latency"].get(kind, {}).get("p95_s")
+            if old_p95 and lat["p95_s"] > old_p95 * (1 + tolerance):
+                worse.append({"script": r["script"], "sessions": r["sessions"], "measure": f"{kind} p95_s",
+                              "baseline": old_p95, "now": lat["p95_s"]})
+        old_req = old["requests_per_session"]
+        if r["requests_per_session"] > old_req * (1 + tolerance):
+            worse.append({"script": r["script"], "sessions": r["sessions"], "measure": "requests_per_session",
+                          "baseline": old_req, "now": r["requests_per_session"]})
+    return worse
+
+
+def _print(r):
+    print(f"{r['script']}: {r['sessions']} sessions, {r['reruns']} reruns in {r['wall_s']:.1f}s, "
+          f"peak {r['peak_threads']} threads, "
+          f"RSS {r['peak_rss_mb'] or 0:.0f} MB, {r['upstream_requests']} upstream requests", flush=True)
+    for kind, lat in r["latency"].items():
+        print(f"  {kind:<8} p50 {lat['p50_s'] * 1000:8.0f} ms  p95 {lat['p95_s'] * 1000:8.0f} ms  "
+              f"max {lat['max_s'] * 1000:8.0f} ms", flush=True)
+    for e in r["errors"]:
+        print(f"  error: {e}", flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run dashboard pages under concurrent headless sessions.")
+    parser.add_argument("--scripts", nargs="+", default=default_scripts())
+    parser.add_argument("--sessions", type=int, nargs="+", default=[10])
+    parser.add_argument("--cycles", type=int, default=3)
+    parser.add_argument("--recordings", help="folder of recorded sheets (default: synthetic sheets)")
+    parser.add_argument("--rows", type=int, default=2_000, help="rows per synthetic sheet")
+    parser.add_argument("--latency", type=float, default=0.2, help="mock sheet latency, seconds")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--change", action="store_true", help="new sheet version on every refresh")
+    parser.add_argument("--timeout", type=float, default=120, help="seconds one rerun may take")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="load_results.json")
+    parser.add_argument("--baseline", help="earlier results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    _share_test_runtime()
+    sheets = load_recordings(args.recordings) if args.recordings else synthetic_sheets(args.rows)
+    server = MockSheetServer(sheets, latency=args.latency, jitter=args.jitter, seed=args.seed).start()
+    os.environ["NPI_SOURCE_URL"] = server.base_url
+    try:
+        results = []
+        for sessions in args.sessions:
+            for script in args.scripts:
+                r = run_script(script, server, sessions, args.cycles, args.change, args.timeout, args.seed)
+                results.append(r)
+                _print(r)
+    finally:
+        server.stop()
+
+    report = {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(), "streamlit": st.__version__,
+            "machine": platform.machine(), "platform": platform.platform(), "cpus": os.cpu_count(),
+            "sheets": args.recordings or f"synthetic, {args.rows} rows", "latency": args.latency,
+            "jitter": args.jitter, "change": args.change, "seed": args.seed,
+        },
+        "results": results,
+    }
+    status = 1 if any(r["errors"] or r["failed_reruns"] for r in results) else 0
+    if args.baseline:
+        report["regressions"] = compare(results, json.loads(Path(args.baseline).read_text()), args.tolerance)
+        for w in report["regressions"]:
+            print(f"WORSE {w['script']} x{w['sessions']} {w['measure']}: {w['baseline']:.3f} -> {w['now']:.3f}")
+        status = status or (1 if report["regressions"] else 0)
+    Path(args.out).write_text(json.dumps(report, indent=2))
+    print(f"wrote {args.out}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
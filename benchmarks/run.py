@@ -0,0 +1,170 @@
+import argparse
+import io
+import json
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.synthetic import SHEETS, sheet  # noqa: E402
+from npi import dates  # noqa: E402
+from npi.render import format_dates, render_table  # noqa: E402
+from npi.sheets import read_dallas, read_milestone, read_readiness, readiness_columns  # noqa: E402
+from npi.status import classify_milestone, classify_readiness, milestone_index, readiness_index  # noqa: E402
+
+# --------------------- BENCHMARK SUITE ---------------------
+# Times each stage of a page run on synthetic sheets of growing size:
+#   parse     CSV bytes -> typed frame (npi.sheets)
+#   dates     date normalization (cold npi.dates cache for milestones, the
+#             readiness target is parsed inside "parse" and timed alone here)
+#   classify  status classification
+#   filter    building the filter index plus one owner/category/group query
+#   html      render_table for one page window and for the whole sheet
+#   csv       the "Download View" export
+# Each stage runs --repeat times; best and median seconds go to a JSON file.
+#
+#   python -m benchmarks.run --sizes 1000 10000 100000 1000000 --out bench.json
+#   python -m benchmarks.run --baseline bench.json   # exit 1 on regressions
+
+SIZES = [1_000, 10_000, 100_000, 1_000_000]
+WINDOW = 100
+
+
+def _time(fn, repeat, setup=None):
+    times = []
+    result = None
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return times, result
+
+
+def _cold_dates():
+    dates._cache.clear()
+
+
+def _readiness_stages(raw, today):
+    df = yield "parse", lambda: read_readiness(raw()), None
+    cols = readiness_columns(df)
+    target_text = pd.read_csv(raw(), usecols=[cols["target"]], dtype=str)[cols["target"]]
+    yield "dates", lambda: dates.parse_dates(target_text), None
+    status, _ = yield "classify", lambda: classify_readiness(df[cols["status"]], df[cols["target"]], today), None
+    df = df.assign(**{"Final Status": status})
+    owner = df[cols["owner"]].dropna().iloc[0]
+    yield "filter", lambda: readiness_index(df, cols).select(owner=owner, group="delayed"), None
+    table = format_dates(df, [cols["target"]])
+    yield "html_window", lambda: render_table(table.iloc[:WINDOW], "Final Status", cols["category"]), None
+    yield "html_full", lambda: render_table(table, "Final Status", cols["category"]), None
+    yield "csv", lambda: df.to_csv(index=False, na_rep="—").encode(), None
+
+
+def _milestone_stages(raw, today):
+    df = yield "parse", lambda: read_milestone(raw()), None
+
+    def parse_dates():
+        return (dates.parse_day_month(df["Plan_Date"], today.year),
+                dates.parse_day_month(df["Actual_Date"], today.year))
+    plan, actual = yield "dates", parse_dates, _cold_dates
+    status, _ = yield "classify", lambda: classify_milestone(plan, actual, today), None
+    df = df.assign(Plan_Date=plan, Actual_Date=actual, Status=status)
+    yield "filter", lambda: milestone_index(df).select(type="WBS", group="delayed"), None
+    table = format_dates(df, ["Plan_Date", "Actual_Date"])
+    yield "html_window", lambda: render_table(table.iloc[:WINDOW], "Status"), None
+    yield "html_full", lambda: render_table(table, "Status"), None
+    yield "csv", lambda: df.to_csv(index=False, na_rep="—").encode(), None
+
+
+def _dallas_stages(raw, today):
+    df = yield "parse", lambda: read_dallas(raw()), None
+    yield "classify", lambda: int(df["Actual"].notna().sum()), None
+    yield "html_window", lambda: render_table(df.iloc[:WINDOW], na_rep="NA"), None
+    yield "html_full", lambda: render_table(df, na_rep="NA"), None
+    yield "csv", lambda: df.to_csv(index=False, na_rep="NA").encode(), None
+
+
+STAGES = {"readiness": _readiness_stages, "milestone": _milestone_stages, "dallas": _dallas_stages}
+
+
+def bench_sheet(name, rows, repeat, today, seed=0):
+    data = sheet(name, rows, seed).getvalue()
+    results = []
+    # Each stage generator yields (stage, fn, setup) and gets fn's result back
+    stages = STAGES[name](lambda: io.BytesIO(data), today)
+    stage, fn, setup = next(stages)
+    while True:
+        times, value = _time(fn, repeat, setup)
+        results.append({
+            "sheet": name, "rows": rows, "bytes": len(data), "stage": stage,
+            "best_s": min(times), "median_s": statistics.median(times),
+            "rows_per_s": rows / min(times) if min(times) else None,
+        })
+        try:
+            stage, fn, setup = stages.send(value)
+        except StopIteration:
+            return results
+
+
+def compare(results, baseline, tolerance):
+    # Stages whose best time grew by more than tolerance (0.25 = 25%)
+    before = {(r["sheet"], r["rows"], r["stage"]): r["best_s"] for r in baseline["results"]}
+    slower = []
+    for r in results:
+        old = before.get((r["sheet"], r["rows"], r["stage"]))
+        if old and r["best_s"] > old * (1 + tolerance):
+            slower.append({**r, "baseline_s": old, "ratio": r["best_s"] / old})
+    return slower
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time each dashboard stage on synthetic tracker sheets.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--sheets", nargs="+", choices=list(SHEETS), default=list(SHEETS))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="bench_results.json")
+    parser.add_argument("--baseline", help="earlier results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    today = pd.Timestamp("2026-06-15")
+    results = []
+    for rows in args.sizes:
+        for name in args.sheets:
+            for r in bench_sheet(name, rows, args.repeat, today, args.seed):
+                results.append(r)
+                print(f"{r['sheet']:>10} {r['rows']:>9,} {r['stage']:<12} "
+                      f"best {r['best_s'] * 1000:10.2f} ms  median {r['median_s'] * 1000:10.2f} ms", flush=True)
+
+    report = {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(), "pandas": pd.__version__, "numpy": np.__version__,
+            "machine": platform.machine(), "platform": platform.platform(),
+            "repeat": args.repeat, "seed": args.seed, "window": WINDOW, "today": today.date().isoformat(),
+        },
+        "results": results,
+    }
+    status = 0
+    if args.baseline:
+        report["regressions"] = compare(results, json.loads(Path(args.baseline).read_text()), args.tolerance)
+        for r in report["regressions"]:
+            print(f"SLOWER {r['sheet']} {r['rows']:,} {r['stage']}: "
+                  f"{r['baseline_s'] * 1000:.2f} -> {r['best_s'] * 1000:.2f} ms (x{r['ratio']:.2f})")
+        status = 1 if report["regressions"] else 0
+    Path(args.out).write_text(json.dumps(report, indent=2))
+    print(f"wrote {args.out}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+import io
+
+import numpy as np
+import pandas as pd
+
+# --------------------- SYNTHETIC SHEETS ---------------------
+# CSV bytes shaped like the published Google Sheets: the headers the column
+# heuristics in npi.sheets look for, repeated categories / owners, messy
+# dd-Mon dates and the "—" / "NA" placeholders people type into the sheets.
+# Seeded, so the same size always produces the same sheet.
+
+OWNERS = ["Ann", "Bob", "Cy", "Dee", "Eli", "Fay", "Gus", "Hana"]
+STATUSES = ["Closed", "closed ", "Done", "Completed", "Open", "WIP", "In Progress", "", "—"]
+TYPO_DATES = ["5 Jan", "12 Mar", "12/03/226", "12-Mar-0226"]
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+
+def _messy_dates(rng, n, year=2026):
+    # Mostly year-less "dd-Mon", plus the other spellings seen in the sheets
+    day = rng.integers(1, 29, n)
+    month = rng.integers(1, 13, n)
+    names = np.array(MONTHS)[month - 1]
+    style = rng.choice(7, n, p=[0.55, 0.1, 0.1, 0.1, 0.05, 0.09, 0.01])
+    out = np.empty(n, dtype=object)
+    out[:] = [f"{d}-{m}" for d, m in zip(day, names)]
+    sel = style == 1
+    out[sel] = [f" {d:02d}-{m} " for d, m in zip(day[sel], names[sel])]
+    sel = style == 2
+    out[sel] = [f"{d:02d}/{m:02d}/{year}" for d, m in zip(day[sel], month[sel])]
+    sel = style == 3
+    out[sel] = [f"{year}-{m:02d}-{d:02d}" for d, m in zip(day[sel], month[sel])]
+    sel = style == 4
+    out[sel] = [f"{d}-{m}-{year}" for d, m in zip(day[sel], names[sel])]
+    out[style == 5] = rng.choice(["—", "NA", ""], int((style == 5).sum()))
+    # Typos that parse to years outside datetime64[ns]; they must come out NaT
+    out[style == 6] = rng.choice(TYPO_DATES, int((style == 6).sum()))
+    return out
+
+
+def _full_dates(rng, n, year=2026):
+    # Readiness targets are typed as dd/mm/yyyy, with the odd placeholder
+    day = rng.integers(1, 29, n)
+    month = rng.integers(1, 13, n)
+    out = np.array([f"{d:02d}/{m:02d}/{year}" for d, m in zip(day, month)], dtype=object)
+    blank = rng.random(n) < 0.1
+    out[blank] = rng.choice(["—", "NA", ""], int(blank.sum()))
+    return out
+
+
+def _csv(df):
+    return df.to_csv(index=False).encode()
+
+
+def readiness_csv(n, seed=0):
+    rng = np.random.default_rng(seed)
+    cats = np.array([f"Process {i:02d}" for i in range(max(1, min(40, n // 25)))])
+    df = pd.DataFrame({
+        "Process Category": np.sort(rng.choice(cats, n)),
+        "Sub Process": [f"Step {i}" for i in range(n)],
+        "Owner": rng.choice(OWNERS + ["—"], n),
+        "Target Date": _full_dates(rng, n),
+        "Status": rng.choice(STATUSES, n),
+        "Remarks": rng.choice(["", "waiting on vendor", "—", "see tracker", "NA"], n),
+        "Comments (old)": rng.choice(["", "x"], n),
+    })
+    return _csv(df)
+
+
+def milestone_csv(n, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "Task": [f"T{i // 3}" for i in range(n)],
+        "Type": rng.choice(["WBS", "Sub Milestone", "Gate"], n),
+        "Plan": _messy_dates(rng, n),
+        "Actual": np.where(rng.random(n) < 0.5, _messy_dates(rng, n), "—"),
+        "Notes": rng.choice(["", "moved", "NA"], n),
+    })
+    return _csv(df)
+
+
+def dallas_csv(n, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        " Sub-Milestones": [f"SM{i}" for i in range(n)],
+        "Plan ": _messy_dates(rng, n),
+        "CWV": rng.integers(1, 53, n),
+        "CW": rng.integers(1, 53, n),
+        "Actual": np.where(rng.random(n) < 0.4, _messy_dates(rng, n), rng.choice(["NA", " ", ""], n)),
+        "Remarks": rng.choice(["", "ok", "NA", "blocked"], n),
+        "Lead time": rng.integers(0, 30, n),
+        "Unused": "",
+    })
+    return _csv(df)
+
+
+SHEETS = {"readiness": readiness_csv, "milestone": milestone_csv, "dallas": dallas_csv}
+
+
+def sheet(name, n, seed=0):
+    return io.BytesIO(SHEETS[name](n, seed))
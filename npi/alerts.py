@@ -0,0 +1,233 @@
+import argparse
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import urllib.request
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from npi.disk import CACHE_DIR
+from npi.trackers import TYPES, source_for
+from npi.sites import TRACKERS
+
+log = logging.getLogger(__name__)
+
+# --------------------- DELAY ALERTS ---------------------
+# Headless evaluator for "newly delayed" items. It subscribes to the shared
+# sources, so it classifies once per snapshot (and once more per day, since
+# items go overdue with the calendar), through the same derived summary the
+# history store uses. Rows entering the "delayed" group since the last
+# evaluation, matched by their stable row key (npi.diff), become alerts.
+#
+# The set of delayed keys per tracker is kept in CACHE_DIR/alerts.json, so a
+# restart does not re-announce items already delayed; the very first
+# evaluation of a tracker only seeds it. Each alert carries an id derived from
+# tracker, key, status and day that receivers can deduplicate on.
+#
+# Alerts wait in a queue per sink, persisted with that state, until the sink
+# accepts them: a webhook that is briefly down gets them on a later round
+# (at most PENDING_MAX per sink, oldest dropped first).
+#
+# Alerts are delivered to sinks, callables taking a list of alert dicts:
+#   log             the "npi.alerts" logger
+#   file:PATH       one JSON line per alert appended to PATH
+#   http(s)://...   POST {"alerts": [...]} as JSON (a local webhook)
+#
+#   python -m npi.alerts --sink log --sink file:alerts.jsonl
+#   NPI_ALERT_SINKS=log,http://127.0.0.1:9000/hook python -m npi.alerts
+#
+# The daemon keeps the sources fresh on their own refresh intervals, so alert
+# latency is the fetch interval whether or not anyone has a page open.
+
+ALERT_TYPES = ("readiness", "milestone")
+STATE_PATH = CACHE_DIR / "alerts.json"
+WEBHOOK_TIMEOUT = 10
+PENDING_MAX = 10_000
+
+
+# --------------------- SINKS ---------------------
+def log_sink(alerts):
+    for a in alerts:
+        log.warning("%s: %s is now %s (plan %s)", a["title"], a["item"], a["status"], a["plan"] or "—")
+
+
+def file_sink(path):
+    path = Path(path)
+
+    def sink(alerts):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            for a in alerts:
+                f.write(json.dumps(a) + "\n")
+    sink.__name__ = f"file:{path}"
+    return sink
+
+
+def webhook_sink(url, timeout=WEBHOOK_TIMEOUT):
+    def sink(alerts):
+        req = urllib.request.Request(url, data=json.dumps({"alerts": alerts}).encode(),
+                                     headers={"Content-Type": "application/json"}, method="POST")
+        with urllib.request.urlopen(req, timeout=timeout):
+            pass
+    sink.__name__ = url
+    return sink
+
+
+def sink_from(spec):
+    if spec == "log":
+        return log_sink
+    if spec.startswith("file:"):
+        return file_sink(spec[len("file:"):])
+    if spec.startswith(("http://", "https://")):
+        return webhook_sink(spec)
+    raise ValueError(f"unknown alert sink {spec!r}")
+
+
+# --------------------- EVALUATOR ---------------------
+def _load_state():
+    try:
+        return json.loads(STATE_PATH.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return {}
+    except Exception:
+        log.exception("could not read alert state, starting fresh")
+        return {}
+
+
+def _save_state(state):
+    STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp = STATE_PATH.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(state), encoding="utf-8")
+    os.replace(tmp, STATE_PATH)
+
+
+def _sink_name(sink):
+    # Names the sink's queue in the saved state
+    return getattr(sink, "__name__", repr(sink))
+
+
+def _alert_id(tracker_id, key, status, day):
+    return hashlib.sha1(f"{tracker_id}\x1f{key}\x1f{status}\x1f{day}".encode()).hexdigest()[:16]
+
+
+class Alerter:
+    def __init__(self, sinks):
+        self.sinks = list(sinks)
+        self.state = _load_state()
+        # Undelivered alerts per sink name, kept under "_pending" in the state
+        saved = self.state.pop("_pending", {})
+        self.pending = {_sink_name(sink): saved.get(_sink_name(sink), []) for sink in self.sinks}
+        self._lock = threading.Lock()
+
+    def watch(self, tracker_id):
+        source = source_for(tracker_id)
+        source.subscribe(f"alerts:{tracker_id}", lambda src, snap: self.evaluate(tracker_id, snap))
+        return source
+
+    def evaluate(self, tracker_id, snap, today=None):
+        # Runs as a source listener: classify, queue alerts, return quickly;
+        # delivery happens in deliver(), off the refresh path
+        t = TRACKERS[tracker_id]
+        today = today or pd.Timestamp.today().normalize()
+        seen = f"{snap.digest}|{today.date().isoformat()}"
+        with self._lock:
+            prev = self.state.get(tracker_id)
+            if prev is not None and prev["seen"] == seen:
+                return []
+        summary = TYPES[t["type"]]["summary"](snap, today, t.get("columns"))
+        delayed = summary[summary["group"] == "delayed"]
+        with self._lock:
+            prev = self.state.get(tracker_id)
+            new = delayed if prev is None else delayed[~delayed["key"].isin(prev["delayed"])]
+            self.state[tracker_id] = {"seen": seen, "delayed": delayed["key"].tolist()}
+            if prev is None:
+                # First evaluation only seeds the state
+                self._save()
+                return []
+            day = today.date().isoformat()
+            alerts = [{
+                "id": _alert_id(tracker_id, key, status, day),
+                "tracker": tracker_id, "title": t["title"].strip(), "site": t["site"],
+                "key": key, "item": key.replace("\x1f", " / "), "category": str(category),
+                "status": status, "plan": plan,
+                "detected_at": datetime.now().isoformat(timespec="seconds"),
+                "fetched_at": datetime.fromtimestamp(snap.fetched_at).isoformat(timespec="seconds"),
+            } for key, category, status, plan in zip(new["key"], new["category"], new["status"], new["plan"])]
+            for name, queue in self.pending.items():
+                queue += alerts
+                if len(queue) > PENDING_MAX:
+                    log.warning("alert sink %s is %d alerts behind, dropping the oldest", name, len(queue))
+                    del queue[:len(queue) - PENDING_MAX]
+            # The keys are only marked seen together with the queued alerts
+            self._save()
+        return alerts
+
+    def _save(self):
+        _save_state({**self.state, "_pending": self.pending})
+
+    def deliver(self):
+        # Hands each sink its queue; a sink that fails keeps its alerts for
+        # the next round. Returns the number of alerts delivered.
+        delivered = 0
+        for sink in self.sinks:
+            name = _sink_name(sink)
+            with self._lock:
+                alerts = list(self.pending[name])
+            if not alerts:
+                continue
+            try:
+                sink(alerts)
+            except Exception:
+                log.exception("alert sink %s failed, %d alerts kept for retry", name, len(alerts))
+                continue
+            with self._lock:
+                # Alerts queued meanwhile stay; ones dropped for PENDING_MAX
+                # are gone already
+                queue = self.pending[name]
+                sent = {a["id"] for a in alerts}
+                queue[:] = [a for a in queue if a["id"] not in sent]
+                self._save()
+            delivered += len(alerts)
+        return delivered
+
+
+def run(tracker_ids=None, sinks=None, once=False):
+    tracker_ids = [tid for tid in tracker_ids or TRACKERS if TRACKERS[tid]["type"] in ALERT_TYPES]
+    alerter = Alerter(sinks or [log_sink])
+    sources = {tid: alerter.watch(tid) for tid in tracker_ids}
+    interval = min(TRACKERS[tid]["refresh"] for tid in tracker_ids)
+    while True:
+        for tid, source in sources.items():
+            try:
+                snap = source.get(wait=True)
+            except Exception as e:
+                log.warning("could not load %s: %s", tid, e)
+                continue
+            # The listener covers refreshes; this covers a snapshot served
+            # from disk and the date rolling over (a no-op otherwise)
+            alerter.evaluate(tid, snap)
+        alerter.deliver()
+        if once:
+            return alerter
+        time.sleep(interval)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Watch the trackers and report items that become delayed.")
+    parser.add_argument("--tracker", action="append", choices=list(TRACKERS), help="default: all that can delay")
+    parser.add_argument("--sink", action="append", help="log | file:PATH | http://host/path (repeatable)")
+    parser.add_argument("--once", action="store_true", help="evaluate once and exit")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+
+    specs = args.sink or [s for s in os.environ.get("NPI_ALERT_SINKS", "log").split(",") if s]
+    run(args.tracker, [sink_from(s) for s in specs], args.once)
+
+
+if __name__ == "__main__":
+    main()
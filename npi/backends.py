@@ -0,0 +1,80 @@
+import os
+import urllib.error
+import urllib.parse
+import urllib.request
+from pathlib import Path
+
+import pandas as pd
+
+# --------------------- SOURCE BACKENDS ---------------------
+# Where a source's bytes come from, chosen by the URL scheme:
+#   http / https   published Google Sheets CSV (or npi.mockserver), with
+#                  conditional requests
+#   file           a local CSV or Parquet file; the mtime / size act as the
+#                  ETag, so an unchanged file is a "304"
+# Every backend returns (raw CSV bytes, etag, last_modified), raw being None
+# when the content is known to be unchanged.
+#
+# The sheet URLs in npi.sites can be redirected wholesale for offline runs,
+# tests and load tests:
+#   NPI_SOURCE_DIR=/path     tracker <id> reads /path/<id>.csv (or .parquet)
+#   NPI_SOURCE_URL=http://h  tracker <id> fetches http://h/<id>.csv
+
+FETCH_TIMEOUT = 30
+
+
+def http_fetch(url, etag=None, last_modified=None):
+    req = urllib.request.Request(url)
+    if etag:
+        req.add_header("If-None-Match", etag)
+    if last_modified:
+        req.add_header("If-Modified-Since", last_modified)
+    try:
+        with urllib.request.urlopen(req, timeout=FETCH_TIMEOUT) as resp:
+            return resp.read(), resp.headers.get("ETag"), resp.headers.get("Last-Modified")
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            return None, etag, last_modified
+        raise
+
+
+def read_file(path):
+    # CSV bytes of a local sheet; Parquet is converted so parsers see one format
+    path = Path(path)
+    if path.suffix == ".parquet":
+        return pd.read_parquet(path).to_csv(index=False).encode()
+    return path.read_bytes()
+
+
+def file_fetch(url, etag=None, last_modified=None):
+    path = Path(urllib.request.url2pathname(urllib.parse.urlsplit(url).path))
+    stat = path.stat()
+    validator = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+    if etag == validator:
+        return None, etag, last_modified
+    return read_file(path), validator, None
+
+
+BACKENDS = {"http": http_fetch, "https": http_fetch, "file": file_fetch}
+
+
+def fetch(url, etag=None, last_modified=None):
+    scheme = urllib.parse.urlsplit(url).scheme
+    try:
+        backend = BACKENDS[scheme]
+    except KeyError:
+        raise ValueError(f"no source backend for {url!r}") from None
+    return backend(url, etag, last_modified)
+
+
+def locate(tracker_id, url):
+    # The URL a tracker is actually read from (see NPI_SOURCE_DIR / _URL)
+    base = os.environ.get("NPI_SOURCE_URL")
+    if base:
+        return f"{base.rstrip('/')}/{tracker_id}.csv"
+    folder = os.environ.get("NPI_SOURCE_DIR")
+    if folder:
+        folder = Path(folder).resolve()
+        parquet = folder / f"{tracker_id}.parquet"
+        return (parquet if parquet.exists() else folder / f"{tracker_id}.csv").as_uri()
+    return url
@@ -0,0 +1,81 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+# --------------------- DATE PARSING ---------------------
+# Milestone sheets mix year-less "dd-Mon" dates ("12-Mar") with full dates and
+# placeholders. Instead of calling pd.to_datetime once per cell, the distinct
+# raw strings are parsed in bulk: two-part dates get the year appended with one
+# vectorized string op, then each explicit format is tried with a single
+# to_datetime call over whatever is still unparsed. Results are cached per
+# (raw string, year) because the same plan dates repeat across rows and
+# refreshes.
+
+FORMATS = ["%d-%b-%Y", "%d-%B-%Y", "%d-%m-%Y", "%d/%m/%Y", "%Y-%m-%d"]
+PLACEHOLDERS = ["", "—", "NA", "nan"]
+CACHE_MAX = 50_000
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def _ns(parsed):
+    # to_datetime may hand back a coarser unit holding years datetime64[ns]
+    # cannot ("5 Jan" -> year 1, "12/03/226"); those are typos, not dates
+    fits = parsed.between(pd.Timestamp.min, pd.Timestamp.max)
+    return parsed.where(fits).astype("datetime64[ns]")
+
+
+def _parse_distinct(raw, year):
+    txt = pd.Series(raw, dtype=object).astype(str).str.strip()
+    # "12-Mar" -> "12-Mar-2026" (only values with exactly one dash)
+    two_part = txt.str.count("-") == 1
+    txt = txt.where(~two_part, txt + f"-{year}")
+
+    out = pd.Series(pd.NaT, index=txt.index, dtype="datetime64[ns]")
+    todo = ~txt.isin(PLACEHOLDERS)
+    for fmt in FORMATS:
+        if not todo.any():
+            break
+        parsed = _ns(pd.to_datetime(txt[todo], format=fmt, errors="coerce"))
+        out[parsed.index] = parsed
+        todo &= out.isna()
+    if todo.any():
+        # Anything left over gets the old dayfirst inference, still in one call
+        out[todo] = _ns(pd.to_datetime(txt[todo], format="mixed", dayfirst=True, errors="coerce"))
+    return out.to_numpy(dtype="datetime64[ns]")
+
+
+def parse_day_month(values, year):
+    codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+    uniques = list(uniques)
+    with _cache_lock:
+        known = {u: _cache[u, year] for u in uniques if (u, year) in _cache}
+    missing = [u for u in uniques if u not in known]
+    if missing:
+        parsed = _parse_distinct(missing, year)
+        known.update(zip(missing, parsed))
+        with _cache_lock:
+            if len(_cache) + len(missing) > CACHE_MAX:
+                _cache.clear()
+            _cache.update(zip(((u, year) for u in missing), parsed))
+    # Looked up from this call's own copy: another thread may clear the cache
+    # meanwhile. One extra NaT slot so factorize's -1 (missing value) maps to NaT
+    lookup = np.empty(len(uniques) + 1, dtype="datetime64[ns]")
+    for i, u in enumerate(uniques):
+        lookup[i] = known[u]
+    lookup[-1] = np.datetime64("NaT")
+    index = values.index if isinstance(values, pd.Series) else None
+    return pd.Series(lookup[codes], index=index)
+
+
+def parse_dates(values):
+    # Full dates in whatever spelling each cell uses (readiness targets), one
+    # to_datetime call over the distinct values. format="mixed" keeps one
+    # spelling from deciding the format for the whole column.
+    codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+    parsed = _ns(pd.to_datetime(pd.Series(uniques, dtype=object), format="mixed", dayfirst=True, errors="coerce"))
+    lookup = np.append(parsed.to_numpy(dtype="datetime64[ns]"), np.datetime64("NaT"))
+    index = values.index if isinstance(values, pd.Series) else None
+    return pd.Series(lookup[codes], index=index)
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+
+# --------------------- SNAPSHOT DIFF ---------------------
+# Rows are keyed by their identifying columns (Task + Milestone_Type, category
+# + sub-process, ...). Repeated keys get an occurrence suffix so every row has
+# a stable, unique key. Consecutive snapshots are compared by key: rows only in
+# the new one are added, rows only in the old one removed, and rows in both are
+# compared cell by cell over the columns both have. Columns the header gained
+# or lost are recorded on their own.
+
+
+class SnapshotDiff:
+    def __init__(self, added, removed, changed, columns_added=(), columns_removed=()):
+        self.added = added        # row labels in the new frame
+        self.removed = removed    # keys that disappeared
+        self.changed = changed    # row label in the new frame -> changed columns
+        self.columns_added = list(columns_added)
+        self.columns_removed = list(columns_removed)
+        self.touched = set(added) | set(changed)
+
+    @property
+    def columns_changed(self):
+        return bool(self.columns_added or self.columns_removed)
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed or self.columns_changed)
+
+    def row_classes(self, labels):
+        # "new" / "chg" / "" per row label, for highlighting in render_table
+        return np.array(
+            ["new" if l in self.added else "chg" if l in self.changed else "" for l in labels],
+            dtype=object,
+        )
+
+
+def row_keys(df, cols):
+    key = df[cols[0]].astype(str)
+    for c in cols[1:]:
+        key = key + "\x1f" + df[c].astype(str)
+    dup = key.groupby(key).cumcount()
+    return key.where(dup == 0, key + "#" + dup.astype(str))
+
+
+def diff_frames(old, old_keys, new, new_keys):
+    o = old.set_axis(old_keys.to_numpy())
+    n = new.set_axis(new_keys.to_numpy())
+    label_of = dict(zip(new_keys.to_numpy(), new.index))
+
+    added = [label_of[k] for k in n.index.difference(o.index, sort=False)]
+    removed = list(o.index.difference(n.index, sort=False))
+
+    cols = [c for c in n.columns if c in o.columns]
+    both = n.index.intersection(o.index, sort=False)
+    a = o.loc[both, cols].to_numpy(dtype=object)
+    b = n.loc[both, cols].to_numpy(dtype=object)
+    neq = (a != b) & ~(pd.isna(a) & pd.isna(b))
+    changed = {}
+    for i in np.flatnonzero(neq.any(axis=1)):
+        changed[label_of[both[i]]] = [c for c, d in zip(cols, neq[i]) if d]
+    return SnapshotDiff(added, removed, changed, [c for c in n.columns if c not in o.columns],
+                        [c for c in o.columns if c not in n.columns])
@@ -0,0 +1,140 @@
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+
+import pandas as pd
+
+# --------------------- ON-DISK SNAPSHOTS ---------------------
+# The last good parsed frame of every source is kept on local disk, so a
+# restarted server can render immediately and a Google Sheets outage degrades
+# to slightly old data instead of an error page. Frames are written as Parquet
+# when pyarrow is available (falling back to pickle for columns Arrow cannot
+# type, or when it is not installed), next to a small JSON file holding the
+# digest / validators needed for conditional refreshes.
+#
+# The JSON also records how the frame was parsed: the source's spec (tracker
+# type and column mapping) and FRAME_VERSION. A snapshot written under another
+# spec or version is not loaded back (see current()), so a deploy that changes
+# a parser or a mapping never serves frames in the old shape, even while the
+# sheet itself is unchanged.
+#
+# Replicas pointing NPI_CACHE_DIR at the same directory share these files
+# (see npi.shared); temporary files carry the process id so concurrent
+# writers never clobber each other's half-written output.
+
+log = logging.getLogger(__name__)
+
+FRAME_VERSION = 2   # bump whenever npi.sheets changes the frames it returns
+
+CACHE_DIR = Path(os.environ.get("NPI_CACHE_DIR", Path(__file__).resolve().parent.parent / ".cache"))
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_ARROW = True
+except ImportError:
+    HAS_ARROW = False
+
+
+def _stem(url):
+    return CACHE_DIR / hashlib.sha1(url.encode()).hexdigest()[:16]
+
+
+TMP = f".{os.getpid()}.tmp"
+
+
+def _replace(tmp, path):
+    os.replace(tmp, path)
+
+
+def _write_meta(stem, meta):
+    with open(f"{stem}.json{TMP}", "w") as f:
+        json.dump(meta, f)
+    _replace(f"{stem}.json{TMP}", f"{stem}.json")
+
+
+def spec_key(spec):
+    return json.dumps(spec, sort_keys=True, default=str)
+
+
+def current(meta, spec):
+    # Whether a persisted snapshot was parsed the way this process parses
+    return meta.get("frame_version") == FRAME_VERSION and meta.get("spec") == spec_key(spec)
+
+
+def save_snapshot(url, snap, spec=None):
+    stem = _stem(url)
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        fmt = "pickle"
+        if HAS_ARROW:
+            try:
+                snap.df.to_parquet(f"{stem}.parquet{TMP}")
+                _replace(f"{stem}.parquet{TMP}", f"{stem}.parquet")
+                fmt = "parquet"
+            except Exception:
+                # Columns mixing text and numbers are not Arrow-typable
+                pass
+        if fmt == "pickle":
+            snap.df.to_pickle(f"{stem}.pkl{TMP}")
+            _replace(f"{stem}.pkl{TMP}", f"{stem}.pkl")
+        meta = {
+            "url": url,
+            "format": fmt,
+            "digest": snap.digest,
+            "etag": snap.etag,
+            "last_modified": snap.last_modified,
+            "fetched_at": snap.fetched_at,
+            "spec": spec_key(spec),
+            "frame_version": FRAME_VERSION,
+        }
+        _write_meta(stem, meta)
+    except Exception:
+        log.exception("could not persist snapshot for %s", url)
+
+
+def touch_snapshot(url, snap, spec=None):
+    # An unchanged refresh: move the persisted fetch time / validators forward
+    stem = _stem(url)
+    try:
+        with open(f"{stem}.json") as f:
+            meta = json.load(f)
+        if meta["digest"] != snap.digest or not current(meta, spec):
+            return save_snapshot(url, snap, spec)
+        meta.update(etag=snap.etag, last_modified=snap.last_modified, fetched_at=snap.fetched_at)
+        _write_meta(stem, meta)
+    except FileNotFoundError:
+        save_snapshot(url, snap, spec)
+    except Exception:
+        log.exception("could not update persisted snapshot for %s", url)
+
+
+def load_meta(url):
+    # Just the JSON side of the persisted snapshot, or None
+    try:
+        with open(f"{_stem(url)}.json") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception:
+        log.exception("could not read persisted snapshot for %s", url)
+        return None
+
+
+def load_snapshot(url):
+    # (df, meta) for the last persisted snapshot of url, or None
+    stem = _stem(url)
+    try:
+        with open(f"{stem}.json") as f:
+            meta = json.load(f)
+        if meta["format"] == "parquet":
+            df = pd.read_parquet(f"{stem}.parquet")
+        else:
+            df = pd.read_pickle(f"{stem}.pkl")
+        return df, meta
+    except FileNotFoundError:
+        return None
+    except Exception:
+        log.exception("could not read persisted snapshot for %s", url)
+        return None
@@ -0,0 +1,245 @@
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+from npi import metrics
+from npi.index import ALL
+from npi.refresh import auto_refresh
+from npi.render import BIG_TABLE_CSS, CHANGE_CSS, TABLE_CSS, cached_export, format_dates, render_window
+from npi.sites import TRACKERS
+from npi.status import MILESTONE_VIEWS, READINESS_VIEWS, milestone_index, readiness_index
+from npi.search import narrow
+from npi.trackers import (MILESTONE_DATES, MILESTONE_SHOWN, TYPES, milestone_frame, readiness_frame,
+                          readiness_table, search_index, source_for)
+from npi.ui import (change_summary, debug_panel, lazy_download, search_box, slip_panel, stale_notice,
+                    table_window, trend_panel)
+
+# --------------------- TRACKER ENGINE ---------------------
+# One engine for every tracker declared in npi.sites: it gets the tracker's
+# shared source and classified frames (npi.trackers), then runs the page:
+# header, freshness notice, metric cards, filters, paged table, change
+# summary, trends, export and auto-refresh.
+# compact=True is the simple.py skin (small header and cards, theme-aware
+# scrollable table); otherwise the full page layout is used.
+
+TABLE_STYLES = {"nt": TABLE_CSS, "big-font-table": BIG_TABLE_CSS}
+
+
+# --------------------- LAYOUT ---------------------
+def _header(t, snap, compact):
+    # The time shown is when the data was fetched, the same on every session
+    # and replica, not when this rerun happened
+    as_of = datetime.fromtimestamp(snap.fetched_at)
+    if compact:
+        st.markdown(f"""
+        <div style="text-align:center; padding:15px; background:{t['colors'][0]}; color:white; border-radius:8px; margin-bottom:20px;">
+            <h1 style="margin:0; font-size:1.8rem;">{t['title']}</h1>
+            <p style="margin:5px 0 0 0; font-size:0.9rem;">
+                Data as of {as_of.strftime('%Y-%m-%d %H:%M:%S')} • Auto-refresh {t['refresh']}s
+            </p>
+        </div>
+        """, unsafe_allow_html=True)
+        return
+    start, end = t["colors"]
+    st.markdown(f"""
+    <div style="text-align:center; padding:20px; background:linear-gradient(135deg, {start} 0%, {end} 100%); color:white; border-radius:16px; margin-bottom:30px; box-shadow: 0 12px 30px rgba(0,0,0,0.2);">
+        <h1 style="margin:0; font-size:2.4rem; font-weight:800;">{t['title']}</h1>
+        <p style="margin:10px 0 0 0; font-size:1.1rem;">
+            Data as of {as_of.strftime('%d-%b-%Y %H:%M:%S')} • Auto-refresh every {t['refresh']}s
+        </p>
+    </div>
+    """, unsafe_allow_html=True)
+
+
+def _freshness(t, source, snap, compact):
+    # Header and freshness notices redraw on their own every refresh
+    # interval, so an unchanged refetch moves "Data as of" forward without a
+    # full rerun (npi.refresh reruns only for new versions and state changes)
+    @st.fragment(run_every=t["refresh"])
+    def draw():
+        current = source.snapshot or snap
+        _header(t, current, compact)
+        stale_notice(source, current)
+
+    draw()
+
+
+def _cards(cards, compact):
+    # cards: [(label, value, background, text color)]
+    if compact:
+        for col, (label, value, bg, fg) in zip(st.columns(len(cards)), cards):
+            col.markdown(f"<div style='background:{bg};color:{fg};padding:15px;border-radius:8px;text-align:center;'>"
+                         f"<p style='margin:0;font-weight:bold;'>{label}</p><h2>{value}</h2></div>",
+                         unsafe_allow_html=True)
+        return
+    if len(cards) == 2:
+        # Two wide cards with spacers around them
+        cols = st.columns([1.5, 5, 1, 5, 1.5])[1::2]
+        box, title, number = "padding:20px 40px", "font-size:1.2rem", "font-size:4.2rem; font-weight:900;"
+    else:
+        cols = st.columns(len(cards))
+        box, title, number = "padding:25px", "font-size:1.3rem", ""
+    for col, (label, value, bg, fg) in zip(cols, cards):
+        col.markdown(f"""
+        <div style="background:{bg}; color:{fg}; {box}; border-radius:16px; text-align:center; box-shadow:0 10px 25px rgba(0,0,0,0.2);">
+            <p style="margin:0; {title}; font-weight:700;">{label}</p>
+            <h2 style="margin:10px 0 0 0; {number}">{value}</h2>
+        </div>
+        """, unsafe_allow_html=True)
+    st.markdown("---")
+
+
+def _table(tracker_id, t, snap, window, today, compact, **kwargs):
+    # Compact tables share the fragment cache under their own name: the
+    # wrapper class is part of the cached HTML
+    if compact:
+        name, wrapper, css = f"{tracker_id}/compact", "scrollable-table", CHANGE_CSS
+    else:
+        wrapper = t.get("table", "nt")
+        name, css = tracker_id, TABLE_STYLES[wrapper] + CHANGE_CSS
+    st.markdown(css, unsafe_allow_html=True)
+    st.markdown(render_window(name, snap, window, today, wrapper_class=wrapper, **kwargs), unsafe_allow_html=True)
+
+
+# --------------------- TRACKER TYPES ---------------------
+# One body per tracker type (npi.trackers.TYPES). Each draws everything between the header and the sidebar, and returns
+# (filter selection, function building the "Download Current View" frame);
+# the export is only built when downloaded.
+
+def _readiness(tracker_id, t, snap, today, compact):
+    df, cols, counts = readiness_frame(t, snap, today)
+    _cards([("Delayed", counts["delayed"], "#ef4444", "white"),
+            ("Open", counts["open"], "#fbbf24", "black" if compact else "white"),
+            ("Closed", counts["closed"], "#22c55e", "white")], compact)
+
+    # Filters: lookups in the per-snapshot index instead of rescanning the frame
+    index = snap.derive(("readiness-index", today), lambda d: readiness_index(df, cols))
+    col1, col2, col3 = st.columns(3)
+    chosen_owner = ALL
+    with col1:
+        if cols["owner"]:
+            chosen_owner = st.selectbox("👤 Owner", [ALL] + index.options("owner"), key=f"{tracker_id}_owner")
+    with col2:
+        categories = [ALL] + index.options("category", owner=chosen_owner)
+        chosen_cat = st.selectbox("📋 Process Category", categories, key=f"{tracker_id}_cat")
+    with col3:
+        view = st.selectbox("🔍 View", list(READINESS_VIEWS), key=f"{tracker_id}_view")
+        group = READINESS_VIEWS[view]
+
+    query = search_box(tracker_id)
+    hits = search_index(tracker_id, snap).search(query)
+    filtered = df.iloc[narrow(index.select(owner=chosen_owner, category=chosen_cat, group=group), hits)]
+
+    urgent = 0
+    if group in (None, "delayed"):
+        urgent = (index.count(owner=chosen_owner, category=chosen_cat, group="delayed") if hits is None else
+                  len(narrow(index.select(owner=chosen_owner, category=chosen_cat, group="delayed"), hits)))
+    if urgent:
+        st.error(f"🚨 URGENT: {urgent} items DELAYED & NOT CLOSED!")
+    else:
+        st.success("✅ All items are On Track or Closed")
+
+    table_df = readiness_table(filtered, cols)
+
+    window = format_dates(table_window(table_df, tracker_id), [cols["target"]] if cols["target"] else [], '%d-%b-%Y')
+    change_summary(snap)
+    _table(tracker_id, t, snap, window, today, compact, status_col="Final Status", group_col=cols["category"])
+
+    trend_panel(tracker_id, "delayed", "Delayed items per category")
+    return (chosen_owner, chosen_cat, group, query), lambda: table_df
+
+
+def _milestone(tracker_id, t, snap, today, compact):
+    df, counts = milestone_frame(t, snap, today)
+    _cards([("🔥 Overdue / Delayed", counts["delayed"], "#ef4444", "white"),
+            ("⏳ Pending", counts["pending"], "#fbbf24", "white")], compact)
+
+    index = snap.derive(("milestone-index", today), lambda d: milestone_index(df))
+    col1, col2 = st.columns(2)
+    with col1:
+        chosen_type = st.selectbox("🔄 Filter by Milestone Type", [ALL] + index.options("type"),
+                                   key=f"{tracker_id}_type")
+    with col2:
+        view = st.selectbox("⚡ Filter by Status", list(MILESTONE_VIEWS), key=f"{tracker_id}_status")
+        group = MILESTONE_VIEWS[view]
+
+    query = search_box(tracker_id)
+    hits = search_index(tracker_id, snap).search(query)
+    filtered = df.iloc[narrow(index.select(type=chosen_type, group=group), hits)]
+
+    urgent = 0
+    if group in (None, "delayed"):
+        urgent = (index.count(type=chosen_type, group="delayed") if hits is None else
+                  len(narrow(index.select(type=chosen_type, group="delayed"), hits)))
+    if urgent:
+        st.error(f"🚨 URGENT: {urgent} milestones DELAYED or OVERDUE!")
+    else:
+        st.success("✅ All milestones are on track")
+
+    # Sorting and paging run on real dates; only the visible page is formatted
+    table_df = filtered[MILESTONE_SHOWN]
+    window = format_dates(table_window(table_df, tracker_id), MILESTONE_DATES)
+
+    headers = {"Milestone_Type": "Milestone Type", "Plan_Date": "Plan Date", "Actual_Date": "Actual Date"}
+    change_summary(snap)
+    _table(tracker_id, t, snap, window, today, compact, status_col="Status", group_col="Task", headers=headers)
+
+    trend_panel(tracker_id, "delayed", "Delayed / overdue milestones per type")
+    slip_panel(tracker_id)
+    return (chosen_type, group, query), lambda: format_dates(table_df, MILESTONE_DATES)
+
+
+def _submilestones(tracker_id, t, snap, today, compact):
+    df = snap.df
+    _cards([("📊 Total Sub-Milestones", len(df), "linear-gradient(135deg, #3b82f6 0%, #1d4ed8 100%)", "white"),
+            ("✅ Completed", int(df["Actual"].notna().sum()),
+             "linear-gradient(135deg, #22c55e 0%, #16a34a 100%)", "white")], compact)
+
+    query = search_box(tracker_id)
+    hits = search_index(tracker_id, snap).search(query)
+    shown = df if hits is None else df.iloc[hits]
+    window = table_window(shown, tracker_id)
+    change_summary(snap)
+    _table(tracker_id, t, snap, window, today, compact, na_rep="NA")
+
+    trend_panel(tracker_id, "completed", "Completed sub-milestones")
+    return (query,), lambda: shown
+
+
+BODIES = {"readiness": _readiness, "milestone": _milestone, "submilestones": _submilestones}
+
+
+# --------------------- PAGE ---------------------
+def run(tracker_id, compact=False):
+    t = TRACKERS[tracker_id]
+    kind = TYPES[t["type"]]
+    metrics.page(f"simple/{tracker_id}" if compact else tracker_id)
+
+    if not compact and st.button("← Back to Dashboard", key=f"back_{tracker_id}"):
+        st.switch_page("app.py")
+
+    source = source_for(tracker_id)
+    try:
+        snap = source.get()
+    except Exception as e:
+        st.error(f"{t['title'].strip()} data load error: {e}")
+        snap = None
+    if snap is None or snap.df.empty:
+        st.warning("No data loaded.")
+        auto_refresh(source, t["refresh"], snap)
+        return
+
+    _freshness(t, source, snap, compact)
+
+    today = pd.Timestamp.today().normalize()
+    selection, export_frame = BODIES[t["type"]](tracker_id, t, snap, today, compact)
+    export_key = (tracker_id, snap.digest, today, selection)
+
+    with st.sidebar:
+        st.success(f"🎯 {t['title'].strip()}")
+        lazy_download("📥 Download Current View", lambda: cached_export(export_key, export_frame, kind["na_rep"]),
+                      t["export"], key=f"{tracker_id}_export")
+
+    debug_panel()
+    auto_refresh(source, t["refresh"], snap)
@@ -0,0 +1,179 @@
+import sqlite3
+import threading
+import time
+from datetime import date, timedelta
+
+import pandas as pd
+
+from npi.disk import CACHE_DIR
+from npi.status import (MILESTONE_GROUPS, READINESS_GROUPS, group_of, prepare_milestone,
+                        prepare_readiness)
+
+# --------------------- SNAPSHOT HISTORY ---------------------
+# Append-only SQLite store next to the snapshot cache. Each source publishes a
+# small per-row summary (key, category, status, group, plan) of every
+# snapshot; the store keeps:
+#   snapshots  one row per distinct content digest (deduplicated)
+#   daily      pre-aggregated counts per day x category x status group, where
+#              the last snapshot seen on a day wins; trend charts read only this
+#   row_state  the last recorded status / plan date per row key
+#   events     status and plan-date transitions per row key, for questions like
+#              "when did this milestone slip"
+
+DB_PATH = CACHE_DIR / "history.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    source TEXT, digest TEXT, fetched_at REAL, rows INTEGER,
+    PRIMARY KEY (source, digest));
+CREATE TABLE IF NOT EXISTS daily (
+    source TEXT, day TEXT, category TEXT, grp TEXT, n INTEGER,
+    PRIMARY KEY (source, day, category, grp));
+CREATE TABLE IF NOT EXISTS row_state (
+    source TEXT, key TEXT, status TEXT, plan TEXT,
+    PRIMARY KEY (source, key));
+CREATE TABLE IF NOT EXISTS events (
+    source TEXT, key TEXT, ts REAL, field TEXT, old TEXT, new TEXT);
+CREATE INDEX IF NOT EXISTS events_key ON events (source, key, ts);
+"""
+
+_recorded = {}   # source -> (day, digest) this process wrote last
+_lock = threading.Lock()
+_ready = False
+
+
+def _connect():
+    global _ready
+    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+    db = sqlite3.connect(DB_PATH, timeout=30)
+    if not _ready:
+        db.execute("PRAGMA journal_mode=WAL")
+        db.executescript(SCHEMA)
+        _ready = True
+    return db
+
+
+def recorded(name, digest, day):
+    # Only the last recorded digest counts: a sheet reverted to earlier
+    # content the same day (A -> B -> A) is a change to record
+    return _recorded.get(name) == (day.isoformat(), digest)
+
+
+def record(name, digest, fetched_at, summary, day=None):
+    day = (day or date.today()).isoformat()
+    with _lock:
+        if _recorded.get(name) == (day, digest):
+            return
+        _write(name, digest, fetched_at, summary, day)
+        # Only once committed: a failed write (e.g. "database is locked") is
+        # retried on the next refresh
+        _recorded[name] = (day, digest)
+
+
+def _write(name, digest, fetched_at, summary, day):
+    summary = summary.astype(object).where(summary.notna(), "—").astype(str)
+    counts = summary.groupby(["category", "group"]).size()
+    db = _connect()
+    try:
+        with db:
+            db.execute("INSERT OR IGNORE INTO snapshots VALUES (?, ?, ?, ?)",
+                       (name, digest, fetched_at, len(summary)))
+            db.execute("DELETE FROM daily WHERE source = ? AND day = ?", (name, day))
+            db.executemany("INSERT INTO daily VALUES (?, ?, ?, ?, ?)",
+                           [(name, day, c, g, int(n)) for (c, g), n in counts.items()])
+
+            prev = pd.read_sql_query("SELECT key, status, plan FROM row_state WHERE source = ?",
+                                     db, params=(name,))
+            cur = summary.drop_duplicates("key", keep="last")
+            both = cur.merge(prev, on="key", how="left", suffixes=("", "_old"))
+            now = time.time()
+            events = []
+            # The first recording of a source only seeds row_state
+            for field in ("status", "plan") if not prev.empty else ():
+                moved = both[both[field] != both[f"{field}_old"]]
+                events += [(name, k, now, field, o if isinstance(o, str) else None, n)
+                           for k, o, n in zip(moved["key"], moved[f"{field}_old"], moved[field])]
+            db.executemany("INSERT INTO events VALUES (?, ?, ?, ?, ?, ?)", events)
+            touched = both[(both["status"] != both["status_old"]) | (both["plan"] != both["plan_old"])]
+            db.executemany("INSERT OR REPLACE INTO row_state VALUES (?, ?, ?, ?)",
+                           list(zip([name] * len(touched), touched["key"], touched["status"], touched["plan"])))
+    finally:
+        db.close()
+
+
+def daily_counts(name, group, days=90):
+    # day x category frame of the number of rows in `group` per day
+    since = (date.today() - timedelta(days=days)).isoformat()
+    db = _connect()
+    try:
+        df = pd.read_sql_query(
+            "SELECT day, category, n FROM daily WHERE source = ? AND grp = ? AND day >= ? ORDER BY day",
+            db, params=(name, group, since))
+    finally:
+        db.close()
+    if df.empty:
+        return df
+    return df.pivot_table(index="day", columns="category", values="n", aggfunc="sum", fill_value=0)
+
+
+def row_events(name, key=None, field=None):
+    sql = "SELECT key, ts, field, old, new FROM events WHERE source = ?"
+    params = [name]
+    if key is not None:
+        sql += " AND key = ?"
+        params.append(key)
+    if field is not None:
+        sql += " AND field = ?"
+        params.append(field)
+    db = _connect()
+    try:
+        df = pd.read_sql_query(sql + " ORDER BY ts", db, params=params)
+    finally:
+        db.close()
+    df["ts"] = pd.to_datetime(df["ts"], unit="s")
+    return df
+
+
+# --------------------- SOURCE SUMMARIES ---------------------
+# Per-row summaries recorded for each tracker. They reuse the pages' derived
+# classification, so recording adds no extra classification work. columns is
+# the tracker's column mapping (npi.sites), as for the parsers.
+
+def _keys(snap):
+    return snap.keys if snap.keys is not None else snap.df.index.astype(str).to_series(index=snap.df.index)
+
+
+def readiness_summary(snap, today, columns=None):
+    df, cols, _ = snap.derive(("readiness", today), lambda d: prepare_readiness(d, today, columns))
+    status = df["Final Status"]
+    plan = df[cols["target"]].dt.strftime("%Y-%m-%d") if cols["target"] else pd.Series("", index=df.index)
+    return pd.DataFrame({"key": _keys(snap), "category": df[cols["category"]], "status": status,
+                         "group": group_of(status, READINESS_GROUPS), "plan": plan.fillna("")})
+
+
+def milestone_summary(snap, today, columns=None):
+    df, _ = snap.derive(("milestone", today), lambda d: prepare_milestone(d, today))
+    status = df["Status"]
+    return pd.DataFrame({"key": _keys(snap), "category": df["Milestone_Type"], "status": status,
+                         "group": group_of(status, MILESTONE_GROUPS),
+                         "plan": df["Plan_Date"].dt.strftime("%Y-%m-%d").fillna("")})
+
+
+def dallas_summary(snap, today, columns=None):
+    df = snap.df
+    done = df["Actual"].notna()
+    status = done.map({True: "Completed", False: "Open"})
+    return pd.DataFrame({"key": _keys(snap), "category": "All", "status": status,
+                         "group": status.str.lower(), "plan": df["Plan"].fillna("NA")})
+
+
+def track(source, name, summarize):
+    # Record every refresh of source under name (idempotent per name)
+    def on_refresh(src, snap):
+        today = pd.Timestamp.today().normalize()
+        if recorded(name, snap.digest, today.date()):
+            return
+        record(name, snap.digest, snap.fetched_at, summarize(snap, today), today.date())
+    source.subscribe(f"history:{name}", on_refresh)
+    if source.snapshot is not None and not source.snapshot.from_disk:
+        on_refresh(source, source.snapshot)
@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+
+from npi import metrics
+
+# --------------------- FILTER INDEX ---------------------
+# Built once per classified snapshot (through Snapshot.derive). For every
+# filter dimension it keeps the sorted row positions per value, plus a count
+# cube over all dimensions. Dropdown options, metric counts and the URGENT
+# banner become cube lookups, and applying the selectboxes is an intersection
+# of position arrays instead of a boolean mask per widget. Rows missing a
+# value are indexed under MISSING, so they can be picked like any other value
+# (the sheets used to show them as "—").
+
+ALL = "All"
+MISSING = "—"
+
+
+def _sorted(values):
+    try:
+        return sorted(values)
+    except TypeError:
+        return sorted(values, key=str)
+
+
+class FilterIndex:
+    def __init__(self, dims):
+        # dims: {dimension name: Series of that dimension's value per row}
+        with metrics.timer("index"):
+            self._build(dims)
+
+    def _build(self, dims):
+        frame = pd.DataFrame({dim: np.asarray(values, dtype=object) for dim, values in dims.items()})
+        frame = frame.where(frame.notna(), MISSING)
+        self.n = len(frame)
+        self.dims = list(dims)
+        self.positions = {
+            dim: {k: np.asarray(v) for k, v in frame.groupby(dim, sort=False).indices.items()}
+            for dim in self.dims
+        }
+        self.cube = frame.groupby(self.dims).size()
+
+    def _cube(self, choices):
+        cube = self.cube
+        for dim, value in choices.items():
+            if value is None or value == ALL:
+                continue
+            level = cube.index.get_level_values(dim)
+            cube = cube[level == value]
+        return cube
+
+    def options(self, dim, **choices):
+        # Values of dim that still have rows under the other choices
+        cube = self._cube(choices)
+        return _sorted(cube.index.get_level_values(dim).unique())
+
+    def count(self, **choices):
+        return int(self._cube(choices).sum())
+
+    def select(self, **choices):
+        # Sorted row positions matching every choice (None / "All" = any)
+        with metrics.timer("filter"):
+            return self._select(choices)
+
+    def _select(self, choices):
+        result = None
+        for dim, value in choices.items():
+            if value is None or value == ALL:
+                continue
+            pos = self.positions[dim].get(value, np.empty(0, dtype=np.intp))
+            result = pos if result is None else np.intersect1d(result, pos, assume_unique=True)
+        return np.arange(self.n) if result is None else result
@@ -0,0 +1,68 @@
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+# --------------------- SHARED LRU ---------------------
+# Process-wide memo for rendered output (table HTML, CSV export bytes), shared
+# by every session. Bounded by the total size of the stored values rather than
+# by entry count, since one full-sheet export can outweigh hundreds of table
+# windows. Least recently used entries are evicted first.
+#
+# computing(key) serializes work per key, so a burst of sessions asking for
+# the same missing value (every display rerunning after a refresh) computes it
+# once; the others wait and pick up the stored result.
+
+
+class SizedLRU:
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight = {}
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return default
+            self._items.move_to_end(key)
+            return item[0]
+
+    def put(self, key, value, size):
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.size -= old[1]
+            if size > self.max_bytes:
+                return
+            self._items[key] = (value, size)
+            self.size += size
+            while self.size > self.max_bytes:
+                _, (_, evicted) = self._items.popitem(last=False)
+                self.size -= evicted
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.size = 0
+
+    @contextmanager
+    def computing(self, key):
+        with self._lock:
+            lock, users = self._inflight.get(key, (None, 0))
+            lock = lock or threading.Lock()
+            self._inflight[key] = (lock, users + 1)
+        try:
+            with lock:
+                yield
+        finally:
+            with self._lock:
+                lock, users = self._inflight[key]
+                if users == 1:
+                    del self._inflight[key]
+                else:
+                    self._inflight[key] = (lock, users - 1)
@@ -0,0 +1,159 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from npi.disk import CACHE_DIR
+
+log = logging.getLogger(__name__)
+
+# --------------------- METRICS ---------------------
+# Lightweight, in-process instrumentation. Stage timings (fetch, parse,
+# classify, filter, render, export, page) and counters (source / derive /
+# fragment cache hits and misses, payload bytes) are kept per label; the label
+# is the page being run on this thread (see page()), or the source name for
+# fetches running in the background.
+#
+# The numbers are shown in the sidebar debug panel (?debug=1, or NPI_DEBUG=1)
+# and published at most every PUBLISH_EVERY seconds as a JSON log line on the
+# "npi.metrics" logger and as CACHE_DIR/metrics.json + metrics.prom, which a
+# log shipper or a node_exporter textfile collector can scrape.
+
+RECENT = 200
+ACTIVE_WINDOW = 300
+PUBLISH_EVERY = 60
+DEBUG = os.environ.get("NPI_DEBUG", "") not in ("", "0")
+
+_stages = {}
+_counters = {}
+_sessions = {}
+_lock = threading.Lock()
+_local = threading.local()
+_published = 0.0
+
+try:
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+except ImportError:
+    get_script_run_ctx = None
+
+
+def _label(label):
+    return label or getattr(_local, "page", None) or "-"
+
+
+def page(name):
+    # Start of a page run: label this thread's timings and count the session
+    _local.page = name
+    _local.started = time.perf_counter()
+    incr("page_runs", name)
+    touch_session()
+
+
+def page_done():
+    started = getattr(_local, "started", None)
+    if started is not None:
+        observe("page", time.perf_counter() - started)
+        _local.started = None
+
+
+def touch_session():
+    ctx = get_script_run_ctx() if get_script_run_ctx else None
+    if ctx is not None:
+        with _lock:
+            _sessions[ctx.session_id] = time.time()
+
+
+def active_sessions():
+    cutoff = time.time() - ACTIVE_WINDOW
+    with _lock:
+        for sid in [s for s, seen in _sessions.items() if seen < cutoff]:
+            del _sessions[sid]
+        return len(_sessions)
+
+
+def observe(stage, seconds, label=None):
+    key = (stage, _label(label))
+    with _lock:
+        s = _stages.get(key)
+        if s is None:
+            s = _stages[key] = {"count": 0, "total": 0.0, "max": 0.0, "recent": deque(maxlen=RECENT)}
+        s["count"] += 1
+        s["total"] += seconds
+        s["max"] = max(s["max"], seconds)
+        s["recent"].append(seconds)
+
+
+@contextmanager
+def timer(stage, label=None):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(stage, time.perf_counter() - start, label)
+
+
+def incr(name, label=None, n=1):
+    key = (name, _label(label))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + n
+
+
+def _quantile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] if values else 0.0
+
+
+def snapshot():
+    with _lock:
+        stages = [
+            {"stage": stage, "label": label, "count": s["count"], "total_s": s["total"],
+             "mean_s": s["total"] / s["count"], "max_s": s["max"],
+             "p50_s": _quantile(s["recent"], 0.5), "p95_s": _quantile(s["recent"], 0.95)}
+            for (stage, label), s in sorted(_stages.items())
+        ]
+        counters = [{"name": name, "label": label, "value": v} for (name, label), v in sorted(_counters.items())]
+    return {"time": time.time(), "pid": os.getpid(), "active_sessions": active_sessions(),
+            "stages": stages, "counters": counters}
+
+
+def prometheus(snap=None):
+    snap = snap or snapshot()
+    lines = ["# TYPE npi_active_sessions gauge", f"npi_active_sessions {snap['active_sessions']}",
+             "# TYPE npi_stage_seconds summary"]
+    for s in snap["stages"]:
+        tags = f'stage="{s["stage"]}",label="{s["label"]}"'
+        lines += [f'npi_stage_seconds{{{tags},quantile="0.5"}} {s["p50_s"]:.6f}',
+                  f'npi_stage_seconds{{{tags},quantile="0.95"}} {s["p95_s"]:.6f}',
+                  f'npi_stage_seconds_sum{{{tags}}} {s["total_s"]:.6f}',
+                  f'npi_stage_seconds_count{{{tags}}} {s["count"]}']
+    lines.append("# TYPE npi_events_total counter")
+    lines += [f'npi_events_total{{name="{c["name"]}",label="{c["label"]}"}} {c["value"]}'
+              for c in snap["counters"]]
+    return "\n".join(lines) + "\n"
+
+
+def _write(path, text):
+    tmp = path.with_suffix(path.suffix + f".{os.getpid()}.tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def publish(force=False):
+    # Throttled: one log line and one file write per PUBLISH_EVERY seconds
+    global _published
+    now = time.time()
+    with _lock:
+        if not force and now - _published < PUBLISH_EVERY:
+            return
+        _published = now
+    snap = snapshot()
+    log.info("metrics %s", json.dumps(snap, separators=(",", ":")))
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        _write(CACHE_DIR / "metrics.json", json.dumps(snap, indent=1))
+        _write(CACHE_DIR / "metrics.prom", prometheus(snap))
+    except OSError as e:
+        log.warning("could not write metrics: %s", e)
@@ -0,0 +1,186 @@
+import argparse
+import hashlib
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from npi.backends import http_fetch, read_file
+from npi.sites import TRACKERS
+
+# --------------------- MOCK SHEET SERVER ---------------------
+# In-process HTTP server that replays recorded sheets, so the dashboard can be
+# run, tested and load-tested with no network. Each sheet is served at
+# /<name>.csv with an ETag (304 on If-None-Match), and the server can inject:
+#   latency / jitter   seconds added to every response
+#   fail_rate          share of requests answered with a 500
+#   down               answer everything with a 503 (an outage)
+#   change_every       rotate each sheet through its recorded versions every
+#                      N seconds (advance(name) does it by hand)
+# All of these are plain attributes and can be changed while it runs.
+#
+# Recordings are a folder of <name>.csv / <name>.parquet files; extra versions
+# of a sheet are <name>.1.csv, <name>.2.csv, ...
+#
+#   python -m npi.mockserver record recordings/       # save the live sheets
+#   python -m npi.mockserver serve recordings/ --port 8765 --latency 0.5
+#   NPI_SOURCE_URL=http://127.0.0.1:8765 streamlit run app.py
+
+VERSION_FILE = re.compile(r"^(?P<name>[^.]+)(?:\.(?P<n>\d+))?\.(?:csv|parquet)$")
+
+
+def load_recordings(folder):
+    # {name: [bytes per version, in order]}
+    found = {}
+    for path in Path(folder).iterdir():
+        m = VERSION_FILE.match(path.name)
+        if m:
+            found.setdefault(m["name"], []).append((int(m["n"] or 0), read_file(path)))
+    return {name: [raw for _, raw in sorted(versions)] for name, versions in found.items()}
+
+
+class MockSheetServer:
+    def __init__(self, sheets, host="127.0.0.1", port=0, latency=0.0, jitter=0.0, fail_rate=0.0,
+                 change_every=None, seed=None):
+        self.sheets = {name: list(v) if isinstance(v, (list, tuple)) else [v] for name, v in sheets.items()}
+        self.latency = latency
+        self.jitter = jitter
+        self.fail_rate = fail_rate
+        self.change_every = change_every
+        self.down = False
+        self.hits = {}
+        self._offsets = {}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url(self, name):
+        return f"{self.base_url}/{name}.csv"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="mock sheets", daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        # Foreground serving, for the command line
+        try:
+            self._httpd.serve_forever()
+        finally:
+            self._httpd.server_close()
+
+    def stop(self):
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread = None
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def advance(self, name, steps=1):
+        with self._lock:
+            self._offsets[name] = self._offsets.get(name, 0) + steps
+
+    def current(self, name):
+        versions = self.sheets[name]
+        step = self._offsets.get(name, 0)
+        if self.change_every:
+            step += int((time.monotonic() - self._started) / self.change_every)
+        return versions[step % len(versions)]
+
+    def _respond(self, handler):
+        name = handler.path.split("?", 1)[0].strip("/").removesuffix(".csv")
+        with self._lock:
+            self.hits[name] = self.hits.get(name, 0) + 1
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0)
+            failed = self.fail_rate and self._random.random() < self.fail_rate
+        if delay:
+            time.sleep(delay)
+        if name not in self.sheets:
+            return handler.send_error(404)
+        if self.down:
+            return handler.send_error(503, "mock outage")
+        if failed:
+            return handler.send_error(500, "mock failure")
+        raw = self.current(name)
+        etag = f'"{hashlib.sha1(raw).hexdigest()[:16]}"'
+        if handler.headers.get("If-None-Match") == etag:
+            handler.send_response(304)
+            handler.send_header("ETag", etag)
+            handler.end_headers()
+            return
+        handler.send_response(200)
+        handler.send_header("Content-Type", "text/csv; charset=utf-8")
+        handler.send_header("Content-Length", str(len(raw)))
+        handler.send_header("ETag", etag)
+        handler.end_headers()
+        handler.wfile.write(raw)
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server._respond(self)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def record(folder):
+    # Save every tracker's live sheet as <tracker id>.csv
+    folder = Path(folder)
+    folder.mkdir(parents=True, exist_ok=True)
+    for tracker_id, t in TRACKERS.items():
+        raw, _, _ = http_fetch(t["url"])
+        (folder / f"{tracker_id}.csv").write_bytes(raw)
+        print(f"{tracker_id}: {len(raw):,} bytes")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Record the tracker sheets or replay them over HTTP.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    rec = sub.add_parser("record")
+    rec.add_argument("folder")
+    serve = sub.add_parser("serve")
+    serve.add_argument("folder")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--latency", type=float, default=0.0)
+    serve.add_argument("--jitter", type=float, default=0.0)
+    serve.add_argument("--fail-rate", type=float, default=0.0)
+    serve.add_argument("--change-every", type=float)
+    serve.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        record(args.folder)
+        return
+    server = MockSheetServer(load_recordings(args.folder), args.host, args.port, args.latency, args.jitter,
+                             args.fail_rate, args.change_every, args.seed)
+    print(f"serving {', '.join(sorted(server.sheets))} at {server.base_url}  "
+          f"(NPI_SOURCE_URL={server.base_url})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+import time
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+from npi import metrics
+from npi.trackers import counts_for, fetch_all, source_for
+from npi.refresh import auto_refresh
+from npi.sites import TRACKERS
+from npi.ui import debug_panel
+
+# --------------------- PORTFOLIO OVERVIEW ---------------------
+# Delayed / open / closed per tracker, grouped by site, from the same shared
+# snapshots and derived frames the tracker pages use. All sources are fetched
+# at once (npi.trackers.fetch_all); each tile starts as a placeholder and is
+# filled as soon as its sheet answers, so one slow sheet never holds up the
+# others. Site totals update with every tile.
+
+
+def _fmt(value):
+    return "—" if value is None else value
+
+
+def _tile(slot, tracker_id, snap, error, seconds, today):
+    t = TRACKERS[tracker_id]
+    with slot.container(border=True):
+        st.markdown(f"**{t['title'].strip()}**")
+        if error is not None:
+            st.error(f"Could not load: {error}")
+            return None
+        counts = counts_for(tracker_id, snap, today)
+        c1, c2, c3 = st.columns(3)
+        c1.metric("Delayed", _fmt(counts["delayed"]))
+        c2.metric("Open", _fmt(counts["open"]))
+        c3.metric("Closed", _fmt(counts["closed"]))
+        note = f"As of {datetime.fromtimestamp(snap.fetched_at).strftime('%d-%b %H:%M:%S')} · {seconds:.1f}s"
+        if snap.from_disk:
+            note += " · saved copy, refreshing"
+        elif source_for(tracker_id).last_error is not None:
+            note += " · sheet unreachable, showing last good data"
+        st.caption(note)
+        if st.button("Open tracker →", key=f"open_{tracker_id}"):
+            st.switch_page(t["page"])
+        return counts
+
+
+def _totals(slot, counts):
+    total = pd.DataFrame(counts).sum(min_count=1)
+    with slot.container():
+        c1, c2, c3 = st.columns(3)
+        for col, key in zip((c1, c2, c3), ("delayed", "open", "closed")):
+            value = total.get(key)
+            col.metric(f"Total {key}", "—" if pd.isna(value) else int(value))
+
+
+def run():
+    metrics.page("overview")
+    if st.button("← Back to Dashboard", key="back_overview"):
+        st.switch_page("app.py")
+    st.markdown("## 📊 Portfolio Overview")
+
+    # Placeholders first, grouped by site in registry order
+    sites = {}
+    for tracker_id, t in TRACKERS.items():
+        sites.setdefault(t["site"], []).append(tracker_id)
+    slots, totals = {}, {}
+    for site, ids in sites.items():
+        st.markdown(f"### {site}")
+        totals[site] = st.empty()
+        for col, tracker_id in zip(st.columns(len(ids)), ids):
+            slots[tracker_id] = col.empty()
+            slots[tracker_id].info(f"⏳ Loading {TRACKERS[tracker_id]['title'].strip()}…")
+
+    today = pd.Timestamp.today().normalize()
+    start = time.monotonic()
+    site_counts = {site: [] for site in sites}
+    snaps = {}
+    slowest = (None, 0.0)
+    for tracker_id, snap, error, seconds in fetch_all():
+        snaps[tracker_id] = snap
+        slowest = max(slowest, (tracker_id, seconds), key=lambda s: s[1])
+        counts = _tile(slots[tracker_id], tracker_id, snap, error, seconds, today)
+        site = TRACKERS[tracker_id]["site"]
+        if counts is not None:
+            site_counts[site].append(counts)
+            _totals(totals[site], site_counts[site])
+
+    loaded = sum(snap is not None for snap in snaps.values())
+    st.caption(f"{loaded} of {len(snaps)} sources in {time.monotonic() - start:.1f}s"
+               + (f" · slowest: {TRACKERS[slowest[0]]['title'].strip()} ({slowest[1]:.1f}s)" if slowest[0] else ""))
+
+    debug_panel()
+    # A sheet that timed out is still being fetched; its watcher reruns the
+    # page as soon as it lands
+    for tracker_id, snap in snaps.items():
+        auto_refresh(source_for(tracker_id), TRACKERS[tracker_id]["refresh"], snap)
@@ -0,0 +1,40 @@
+import streamlit as st
+
+from npi import metrics
+
+# --------------------- AUTO-REFRESH ---------------------
+# Replaces the old `while True: time.sleep(...); st.rerun()` loops. Each page
+# registers a small fragment with run_every=interval; the browser drives the
+# timer, so no server thread sleeps on behalf of an open tab. On each tick the
+# fragment asks the shared source for its snapshot (a no-op while it is fresh;
+# once it expires, one background refresh starts and the tick returns at once)
+# and triggers a full rerun only when this session drew something else: a new
+# version, saved data replaced by a refetch, or the source failing /
+# recovering. New data shows on the tick after it lands. An unchanged refetch
+# only moves the fetch time, which the page's own freshness fragment redraws
+# (npi.engine), so it wakes no full reruns.
+
+
+def _token(source, snap):
+    if snap is None:
+        return None
+    return snap.version, snap.from_disk, source.last_error is None
+
+
+def auto_refresh(source, interval, rendered=None):
+    # rendered: the snapshot this run drew (None when nothing could be loaded)
+    seen_key = f"_refresh_seen:{source.url}"
+    st.session_state[seen_key] = _token(source, rendered)
+
+    @st.fragment(run_every=interval)
+    def watch():
+        metrics.touch_session()
+        try:
+            snap = source.get()
+        except Exception:
+            # Keep showing what we have; the next tick retries
+            return
+        if _token(source, snap) != st.session_state.get(seen_key):
+            st.rerun()
+
+    watch()
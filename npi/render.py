@@ -0,0 +1,190 @@
+import html
+
+import numpy as np
+import pandas as pd
+
+from npi import metrics
+from npi import status as S
+from npi.memo import SizedLRU
+
+# --------------------- TABLE RENDERING ---------------------
+# Builds the tracker tables from whole columns instead of iterrows(). Each
+# column is factorized, so escaping and status-class lookup run once per
+# distinct value, and rows are assembled with element-wise string concatenation
+# over object arrays. Styling lives in TABLE_CSS behind short class names
+# rather than being repeated inline on every cell.
+
+STATUS_CLASSES = {
+    S.DELAYED: "sd",
+    S.OVERDUE: "sd",
+    S.MS_DELAYED: "sd",
+    S.CLOSED_ON_TIME: "sc",
+    S.COMPLETED: "sc",
+    S.CLOSED_LATE: "sl",
+    S.OPEN: "so",
+    S.PENDING: "so",
+}
+
+TABLE_CSS = """
+<style>
+.nt{overflow-x:auto;margin:20px 0}
+.nt table{width:100%;border-collapse:collapse;font-family:Arial,sans-serif}
+.nt th{background:#1e40af;color:white;padding:15px;text-align:left;font-weight:800}
+.nt td{padding:12px;border:1px solid #ddd}
+.sd{background:#ef4444!important;color:white!important;font-weight:bold!important}
+.sc{background:#22c55e!important;color:white!important;font-weight:bold!important}
+.sl{background:#86efac!important;color:black!important;font-weight:bold!important}
+.so{background:#fbbf24!important;color:black!important;font-weight:bold!important}
+</style>
+"""
+
+# Larger, non-wrapping variant used by the sub-milestone trackers
+BIG_TABLE_CSS = """
+<style>
+.big-font-table table{width:100%!important;font-size:18px!important;border-collapse:collapse}
+.big-font-table td,.big-font-table th{padding:14px!important;text-align:left!important;border:1px solid #ddd!important;white-space:nowrap!important}
+.big-font-table th{background:#1e40af!important;color:white!important;font-weight:bold!important}
+.big-font-table tr:nth-child(even){background-color:#f8fafc!important}
+</style>
+"""
+
+# Rows added / changed since the previous snapshot (see npi.diff)
+CHANGE_CSS = """
+<style>
+tr.new td:first-child{box-shadow:inset 6px 0 #6366f1}
+tr.chg td:first-child{box-shadow:inset 6px 0 #f97316}
+</style>
+"""
+
+
+def _column(values, na_rep):
+    # (codes, escaped text per code); code -1 (missing) maps to the last slot
+    codes, uniques = pd.factorize(values)
+    text = np.array([html.escape(str(u)) for u in uniques] + [na_rep], dtype=object)
+    return codes, uniques, text
+
+
+def render_table(df, status_col=None, group_col=None, headers=None,
+                 wrapper_class="nt", na_rep="—", row_classes=None):
+    headers = headers or {}
+    head = "".join(f"<th>{html.escape(str(headers.get(c, c)))}</th>" for c in df.columns)
+    if row_classes is None:
+        rows = np.full(len(df), "<tr>", dtype=object)
+    else:
+        rows = np.where(row_classes == "", "<tr>", '<tr class="' + row_classes + '">').astype(object)
+    for i, col in enumerate(df.columns):
+        codes, uniques, text = _column(df.iloc[:, i], na_rep)
+        cells = text[codes]
+        if col == group_col:
+            # Blank a grouped cell when it repeats the row above
+            repeat = np.r_[False, codes[1:] == codes[:-1]]
+            cells = np.where(repeat, "", cells)
+        if col == status_col:
+            tags = np.array(
+                [f'<td class="{STATUS_CLASSES[u]}">' if u in STATUS_CLASSES else "<td>" for u in uniques]
+                + ["<td>"],
+                dtype=object,
+            )
+            rows = rows + tags[codes] + cells + "</td>"
+        else:
+            rows = rows + "<td>" + cells + "</td>"
+    body = "".join((rows + "</tr>").tolist())
+    return (f'<div class="{wrapper_class}"><table><thead><tr>{head}</tr></thead>'
+            f'<tbody>{body}</tbody></table></div>')
+
+
+def format_dates(df, cols, fmt='%d-%b', na_rep="—"):
+    # Display copy with datetime columns turned into short day-month text
+    return df.assign(**{c: df[c].dt.strftime(fmt).fillna(na_rep) for c in cols})
+
+
+# --------------------- FRAGMENT REUSE ---------------------
+# Rendered windows are kept per (table, day, row keys shown, columns), in a
+# size-bounded LRU shared by every session (npi.memo). The row keys capture the
+# filter, sort and page selection; the theme only changes page CSS, never the
+# table HTML, so it is not part of the key. A window is reused as is for the
+# same snapshot, and carried over to the next snapshot when none of its rows
+# were added or changed, the sheet kept its columns and it carried no
+# highlights. Sessions missing the same
+# window at once render it once.
+
+FRAGMENTS_MAX_BYTES = 64 * 1024 * 1024
+
+_fragments = SizedLRU(FRAGMENTS_MAX_BYTES)
+
+
+def render_window(name, snap, window, today, **kwargs):
+    with metrics.timer("render"):
+        html_ = _render_window(name, snap, window, today, **kwargs)
+    metrics.incr("html_bytes", n=len(html_))
+    return html_
+
+
+def _cached_window(cache_key, snap, window):
+    entry = _fragments.get(cache_key)
+    if entry is None:
+        return None
+    version, highlighted, html_ = entry
+    untouched = snap.diff is None or (not snap.diff.columns_changed and snap.diff.touched.isdisjoint(window.index))
+    if version == snap.version:
+        return html_
+    if version == snap.version - 1 and not highlighted and untouched:
+        _fragments.put(cache_key, (snap.version, highlighted, html_), len(html_))
+        return html_
+    return None
+
+
+def _render_window(name, snap, window, today, **kwargs):
+    row_classes = None
+    if snap.diff:
+        row_classes = snap.diff.row_classes(window.index)
+    if snap.keys is None:
+        return render_table(window, row_classes=row_classes, **kwargs)
+
+    cache_key = (name, today, tuple(snap.keys.reindex(window.index)), tuple(window.columns))
+    html_ = _cached_window(cache_key, snap, window)
+    if html_ is None:
+        with _fragments.computing(cache_key):
+            html_ = _cached_window(cache_key, snap, window)
+            if html_ is None:
+                metrics.incr("fragment_miss")
+                html_ = render_table(window, row_classes=row_classes, **kwargs)
+                highlighted = row_classes is not None and bool((row_classes != "").any())
+                _fragments.put(cache_key, (snap.version, highlighted, html_), len(html_))
+                return html_
+    metrics.incr("fragment_hit")
+    return html_
+
+
+# --------------------- CSV EXPORT ---------------------
+# Export bytes are built only when a download is asked for, and kept per
+# (table, snapshot digest, day, filter selection) in their own size-bounded
+# LRU, so every session downloading the same view shares one to_csv call.
+
+EXPORTS_MAX_BYTES = 128 * 1024 * 1024
+
+_exports = SizedLRU(EXPORTS_MAX_BYTES)
+
+
+def export_csv(df, na_rep="—"):
+    # Bytes for the "Download View" buttons, placeholders filled like the table
+    with metrics.timer("export"):
+        data = df.to_csv(index=False, na_rep=na_rep).encode()
+    metrics.incr("csv_bytes", n=len(data))
+    return data
+
+
+def cached_export(key, make_frame, na_rep="—"):
+    # key: hashable (table, snapshot digest, day, selection); make_frame()
+    # returns the frame to export and only runs on a miss
+    data = _exports.get(key)
+    if data is None:
+        with _exports.computing(key):
+            data = _exports.get(key)
+            if data is None:
+                metrics.incr("export_miss")
+                data = export_csv(make_frame(), na_rep)
+                _exports.put(key, data, len(data))
+                return data
+    metrics.incr("export_hit")
+    return data
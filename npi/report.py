@@ -0,0 +1,176 @@
+import argparse
+import hashlib
+import html
+import logging
+import re
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from npi.disk import HAS_ARROW
+from npi.render import BIG_TABLE_CSS, TABLE_CSS, export_csv, format_dates, render_table
+from npi.sites import TRACKERS
+from npi.trackers import (MILESTONE_DATES, MILESTONE_SHOWN, TYPES, counts_for, fetch_all, milestone_frame,
+                          readiness_frame, readiness_table)
+
+log = logging.getLogger(__name__)
+
+# --------------------- BATCH REPORTS ---------------------
+# Headless replacement for clicking "Download View" on every page: fetches all
+# trackers in parallel through the same sources and classification as the
+# dashboard (npi.trackers), and writes, per site, each tracker's full table
+# plus one file per filter value:
+#
+#   reports/summary.csv                         delayed / open / closed per tracker
+#   reports/<site>/<tracker>.<fmt>              full classified table
+#   reports/<site>/<tracker>/<filter>/<value>.<fmt>
+#
+# Filters are owner / category (readiness) and type (milestone). Formats:
+# csv (as the page export), parquet (real dates; needs pyarrow), xlsx (needs
+# openpyxl) and html (a static page with the dashboard's table styling).
+#
+#   python -m npi.report --out reports/ --format csv xlsx html --by owner type
+#
+# No Streamlit session is involved, so it runs from cron; it exits 1 if any
+# tracker could not be loaded.
+
+FORMATS = ("csv", "parquet", "xlsx", "html")
+FILTERS = ("owner", "category", "type")
+REPORT_TIMEOUT = 120
+
+PAGE = """<!doctype html>
+<html><head><meta charset="utf-8"><title>{title}</title>{css}
+<style>body{{font-family:Arial,sans-serif;margin:24px}} p{{color:#555}}</style></head>
+<body><h1>{title}</h1><p>Data as of {as_of} · {rows} rows</p>{table}</body></html>
+"""
+
+
+def _slug(value):
+    return re.sub(r"[^\w.-]+", "_", str(value)).strip("_.") or "blank"
+
+
+def _unique_slug(value, used):
+    # Values that slug alike ("R&D", "R D") get a short hash of the value
+    slug = _slug(value)
+    if slug.lower() in used:
+        slug = f"{slug}-{hashlib.sha1(str(value).encode()).hexdigest()[:8]}"
+    used.add(slug.lower())
+    return slug
+
+
+def view(tracker_id, snap, today):
+    # What a tracker's report shows: the table frame plus how to present and
+    # split it, matching its dashboard page
+    t = TRACKERS[tracker_id]
+    kind = t["type"]
+    if kind == "readiness":
+        df, cols, _ = readiness_frame(t, snap, today)
+        return {"frame": readiness_table(df, cols), "dates": [cols["target"]] if cols["target"] else [],
+                "date_format": "%d-%b-%Y", "status_col": "Final Status", "group_col": cols["category"],
+                "filters": {name: cols[name] for name in ("owner", "category") if cols[name]}}
+    if kind == "milestone":
+        df, _ = milestone_frame(t, snap, today)
+        return {"frame": df[MILESTONE_SHOWN], "dates": MILESTONE_DATES, "date_format": "%d-%b",
+                "status_col": "Status", "group_col": "Task", "filters": {"type": "Milestone_Type"},
+                "headers": {"Milestone_Type": "Milestone Type", "Plan_Date": "Plan Date",
+                            "Actual_Date": "Actual Date"}}
+    return {"frame": snap.df, "dates": [], "date_format": None, "status_col": None, "group_col": None,
+            "filters": {}}
+
+
+def write(frame, path, fmt, v, title, as_of, na_rep, wrapper="nt"):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if fmt == "parquet":
+        frame.to_parquet(path, index=False)
+        return
+    if fmt == "xlsx":
+        frame.to_excel(path, index=False)
+        return
+    shown = format_dates(frame, v["dates"], v["date_format"], na_rep) if v["dates"] else frame
+    if fmt == "csv":
+        path.write_bytes(export_csv(shown, na_rep))
+        return
+    table = render_table(shown, v["status_col"], v["group_col"], v.get("headers"), wrapper, na_rep)
+    css = BIG_TABLE_CSS if wrapper == "big-font-table" else TABLE_CSS
+    path.write_text(PAGE.format(title=html.escape(title), css=css, as_of=as_of, rows=len(frame), table=table),
+                    encoding="utf-8")
+
+
+def run(out, formats=("csv",), by=(), tracker_ids=None, today=None, timeout=REPORT_TIMEOUT):
+    # Returns (written paths, {tracker_id: error}) for the trackers that failed
+    out = Path(out)
+    today = today or pd.Timestamp.today().normalize()
+    written, failed, summary = [], {}, []
+    for tracker_id, snap, error, seconds in fetch_all(tracker_ids, wait_fresh=True, timeout=timeout):
+        t = TRACKERS[tracker_id]
+        if error is not None:
+            log.error("%s: could not load: %s", tracker_id, error)
+            failed[tracker_id] = error
+            continue
+        title = t["title"].strip()
+        as_of = datetime.fromtimestamp(snap.fetched_at).strftime("%d-%b-%Y %H:%M:%S")
+        na_rep = TYPES[t["type"]]["na_rep"]
+        wrapper = t.get("table", "nt")
+        v = view(tracker_id, snap, today)
+        frame = v["frame"]
+        base = out / _slug(t["site"])
+
+        parts = [(base / tracker_id, title, frame)]
+        for name in by:
+            col = v["filters"].get(name)
+            if col is None:
+                continue
+            used = set()
+            for value, part in frame.groupby(col, observed=True, sort=True):
+                parts.append((base / tracker_id / name / _unique_slug(value, used), f"{title} · {name}: {value}",
+                              part))
+        for stem, part_title, part in parts:
+            for fmt in formats:
+                path = stem.with_suffix(f".{fmt}")
+                write(part, path, fmt, v, part_title, as_of, na_rep, wrapper)
+                written.append(path)
+
+        counts = counts_for(tracker_id, snap, today)
+        summary.append({"site": t["site"], "tracker": tracker_id, "title": title, "rows": len(frame),
+                        **counts, "as_of": as_of, "fetch_s": round(seconds, 2)})
+        log.info("%s: %d rows, %d files", tracker_id, len(frame), len(parts) * len(formats))
+
+    if summary:
+        out.mkdir(parents=True, exist_ok=True)
+        order = {tid: i for i, tid in enumerate(TRACKERS)}
+        summary.sort(key=lambda r: order[r["tracker"]])
+        counts = ["delayed", "open", "closed"]
+        pd.DataFrame(summary).astype(dict.fromkeys(counts, "Int64")).to_csv(out / "summary.csv", index=False)
+        written.append(out / "summary.csv")
+    return written, failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write tracker reports without a browser session.")
+    parser.add_argument("--out", default="reports")
+    parser.add_argument("--format", nargs="+", choices=FORMATS, default=["csv"], dest="formats")
+    parser.add_argument("--by", nargs="+", choices=FILTERS, default=[], help="also split by these filters")
+    parser.add_argument("--tracker", nargs="+", choices=list(TRACKERS), help="default: all")
+    parser.add_argument("--today", type=pd.Timestamp, help="classify as of this date (default: today)")
+    parser.add_argument("--timeout", type=float, default=REPORT_TIMEOUT, help="seconds to wait per sheet")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+
+    if "parquet" in args.formats and not HAS_ARROW:
+        parser.error("parquet output needs pyarrow")
+    if "xlsx" in args.formats:
+        try:
+            import openpyxl  # noqa: F401
+        except ImportError:
+            parser.error("xlsx output needs openpyxl")
+
+    today = args.today.normalize() if args.today is not None else None
+    written, failed = run(args.out, args.formats, args.by, args.tracker, today, args.timeout)
+    print(f"wrote {len(written)} files to {args.out}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+import hashlib
+import logging
+import re
+import threading
+
+from npi import metrics
+
+log = logging.getLogger(__name__)
+
+# --------------------- SHEET SCHEMAS ---------------------
+# Which header plays which role in a sheet (category, owner, status, ...),
+# resolved once per distinct header row instead of on every rerun. The header
+# is fingerprinted, and the mapping for a fingerprint (plus the tracker's
+# overrides from npi.sites) is cached; later snapshots and reruns with the
+# same header are a dictionary lookup.
+#
+# Rules are declarative, one per role (see sheets.READINESS_RULES):
+#
+#   "match"     regex searched in the normalized header (lowercase, single
+#               spaces); must match at most one header
+#   "fallback"  optional position used when nothing matches
+#
+# A role matched by several headers, or a header claimed by several roles,
+# raises SchemaError naming the candidates; an override naming a header the
+# sheet does not have does too. The source then keeps serving the last good
+# snapshot with the error shown, instead of a table with the wrong columns.
+# Overriding the role in the tracker's "columns" mapping settles it.
+#
+# Parsers also report each tracker's header to watch(): the first time a
+# different header shows up, it is logged once as a warning with the added and
+# removed headers and the new mapping, and counted as schema_change.
+
+
+class SchemaError(ValueError):
+    pass
+
+
+_resolved = {}       # (fingerprint, rules, overrides) -> mapping
+_seen = {}           # tracker name -> (fingerprint, header)
+_lock = threading.Lock()
+
+
+def fingerprint(header):
+    return hashlib.sha1("\x1f".join(map(str, header)).encode()).hexdigest()[:12]
+
+
+def _normalize(name):
+    return " ".join(str(name).lower().split())
+
+
+def _match(header, rules, columns):
+    found = dict(columns)
+    missing = [h for h in found.values() if h and h not in header]
+    if missing:
+        raise SchemaError(f"columns mapping names headers the sheet does not have: {missing}")
+    free = [h for h in header if h not in found.values()]
+    claimed = {}
+    for role, rule in rules.items():
+        if role in found:
+            continue
+        hits = [h for h in free if re.search(rule["match"], _normalize(h))]
+        if len(hits) > 1:
+            raise SchemaError(f"{role}: ambiguous, headers {hits} all match {rule['match']!r}; "
+                              f"set it in the tracker's columns mapping")
+        if hits:
+            claimed.setdefault(hits[0], []).append(role)
+            found[role] = hits[0]
+        elif "fallback" in rule and len(header) > rule["fallback"]:
+            found[role] = header[rule["fallback"]]
+        else:
+            found[role] = None
+    shared = {h: roles for h, roles in claimed.items() if len(roles) > 1}
+    if shared:
+        raise SchemaError(f"headers matched by several roles: {shared}; set them in the tracker's columns mapping")
+    return {role: found.get(role) for role in dict.fromkeys([*rules, *found])}
+
+
+def resolve(header, rules, columns=None):
+    # role -> header (None where the sheet has no such column); columns
+    # (role -> header) overrides the rules
+    header = list(header)
+    key = (fingerprint(header), id(rules), tuple(sorted((columns or {}).items())))
+    mapping = _resolved.get(key)
+    if mapping is None:
+        metrics.incr("schema_resolve")
+        mapping = _resolved[key] = _match(header, rules, columns or {})
+    return dict(mapping)
+
+
+def watch(name, header, mapping=None):
+    # Record the header a tracker's sheet came with; a change is logged once
+    if name is None:
+        return
+    header = list(header)
+    fp = fingerprint(header)
+    with _lock:
+        before = _seen.get(name)
+        _seen[name] = (fp, header)
+    if before is None or before[0] == fp:
+        return
+    added = [h for h in header if h not in before[1]]
+    removed = [h for h in before[1] if h not in header]
+    log.warning("%s: sheet header changed (%s -> %s), added %s, removed %s; columns now %s",
+                name, before[0], fp, added, removed, mapping if mapping is not None else header)
+    metrics.incr("schema_change", name)
@@ -0,0 +1,112 @@
+import re
+from functools import reduce
+
+import numpy as np
+import pandas as pd
+
+from npi import metrics
+
+# --------------------- TEXT SEARCH ---------------------
+# Inverted index over a tracker's free-text columns (task, sub-milestone,
+# remarks, ...), built once per snapshot through Snapshot.derive. Text is
+# lowercased and split into word tokens; the vocabulary is kept sorted, with
+# each token's row positions stored contiguously, so a prefix matches one
+# slice of the postings. A query is whitespace-separated terms, each matching
+# words that start with it, all of which must match (AND). Results are sorted
+# row positions, the same currency as npi.index.FilterIndex.select, so search
+# and the selectboxes combine with one intersection.
+#
+# Refreshes are incremental: the index of the tracker's previous snapshot is
+# kept, and rows whose row key and text are unchanged reuse its tokens; only
+# added or edited rows are tokenized again.
+
+TOKEN = re.compile(r"\w+")
+
+_last = {}   # name -> TextIndex of the last snapshot indexed
+
+
+def _tokenize(text):
+    return pd.Series(text, dtype=object).str.findall(TOKEN).to_numpy(dtype=object)
+
+
+def _joined(df, columns):
+    # Lowercased text of the given columns per row, as one string
+    parts = [df[c].astype(object).where(df[c].notna(), "").astype(str) for c in columns]
+    if not parts:
+        return np.full(len(df), "", dtype=object)
+    return reduce(lambda a, b: a + " " + b, parts).str.lower().to_numpy(dtype=object)
+
+
+class TextIndex:
+    def __init__(self, text, keys=None, previous=None):
+        # text: lowercased searchable text per row position; keys: row keys
+        # (npi.diff) for reuse by the next snapshot's index
+        with metrics.timer("search_index"):
+            self.text = text
+            self.keys = None if keys is None else np.asarray(keys, dtype=object)
+            self.row_tokens = self._tokens(previous)
+            self._build()
+
+    def _tokens(self, previous):
+        # Token list per row (object array); rows whose key and text match
+        # the previous index take its lists as they are
+        if previous is None or self.keys is None or previous.keys is None:
+            return _tokenize(self.text)
+        where = pd.Index(previous.keys, dtype=object).get_indexer(self.keys)
+        same = where >= 0
+        same[same] = previous.text[where[same]] == self.text[same]
+        tokens = np.empty(len(self.text), dtype=object)
+        tokens[same] = previous.row_tokens[where[same]]
+        changed = np.flatnonzero(~same)
+        for i, row in zip(changed, _tokenize(self.text[changed])):
+            tokens[i] = row
+        metrics.incr("search_rows_reused", n=int(same.sum()))
+        return tokens
+
+    def _build(self):
+        self.n = len(self.row_tokens)
+        lengths = np.fromiter(map(len, self.row_tokens), dtype=np.intp, count=self.n)
+        flat = np.fromiter((tok for tokens in self.row_tokens for tok in tokens), dtype=object,
+                           count=int(lengths.sum()))
+        rows = np.repeat(np.arange(self.n), lengths)
+        codes, vocab = pd.factorize(flat, sort=True)
+        # One posting per (token, row), ordered by token then row
+        order = np.lexsort((rows, codes))
+        codes, rows = codes[order], rows[order]
+        keep = np.ones(len(codes), dtype=bool)
+        keep[1:] = (codes[1:] != codes[:-1]) | (rows[1:] != rows[:-1])
+        self.vocab = np.asarray(vocab, dtype=object)
+        self.rows = rows[keep]
+        self.offsets = np.searchsorted(codes[keep], np.arange(len(self.vocab) + 1))
+
+    def _term(self, term):
+        # Sorted positions of rows with a word starting with term
+        lo, hi = np.searchsorted(self.vocab, [term, term + "\U0010ffff"])
+        postings = self.rows[self.offsets[lo]:self.offsets[hi]]
+        return postings if hi - lo == 1 else np.unique(postings)
+
+    def search(self, query):
+        # Sorted row positions matching every term; None for an empty query
+        terms = TOKEN.findall(query.lower())
+        if not terms:
+            return None
+        with metrics.timer("search"):
+            result = None
+            for term in sorted(set(terms), key=len, reverse=True):
+                pos = self._term(term)
+                result = pos if result is None else np.intersect1d(result, pos, assume_unique=True)
+                if not len(result):
+                    break
+            return result
+
+
+def narrow(positions, hits):
+    # Row positions also matching a search (hits None = no search)
+    return positions if hits is None else np.intersect1d(positions, hits, assume_unique=True)
+
+
+def text_index(name, snap, columns):
+    # Index of snap's columns; meant to run through Snapshot.derive
+    index = TextIndex(_joined(snap.df, columns), snap.keys, _last.get(name))
+    _last[name] = index
+    return index
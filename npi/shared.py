@@ -0,0 +1,59 @@
+import os
+import socket
+import sqlite3
+import time
+
+from npi.disk import CACHE_DIR
+
+# --------------------- SHARED CACHE TIER ---------------------
+# Optional, for several dashboard processes behind a load balancer. With
+# NPI_SHARED_CACHE=1 and NPI_CACHE_DIR pointing at the same directory on every
+# replica, the persisted snapshots (npi.disk) become the shared copy: when a
+# source's refresh window runs out, a replica first adopts a fresh snapshot
+# another replica has published, and only fetches itself if it holds the
+# source's lease. Upstream sees one fetch per refresh window for the whole
+# deployment, and every replica serves the same data with the same fetch time.
+#
+# Leases live in CACHE_DIR/leases.sqlite, one row per source URL. The leader
+# renews its lease on each refresh; if it stops refreshing (no traffic, or the
+# process died) the lease lapses LEASE_GRACE seconds after its refresh window
+# and the next replica to ask takes over.
+
+ENABLED = os.environ.get("NPI_SHARED_CACHE", "") not in ("", "0")
+LEASE_GRACE = 10
+POLL = 1.0
+HOLDER = f"{socket.gethostname()}:{os.getpid()}"
+DB_PATH = CACHE_DIR / "leases.sqlite"
+
+SCHEMA = "CREATE TABLE IF NOT EXISTS leases (name TEXT PRIMARY KEY, holder TEXT, expires REAL)"
+
+_ready = False
+
+
+def _connect():
+    global _ready
+    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+    db = sqlite3.connect(DB_PATH, timeout=30)
+    if not _ready:
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute(SCHEMA)
+        _ready = True
+    return db
+
+
+def lead(name, seconds):
+    # Take or renew the lease on name for seconds; False while another
+    # process holds an unexpired one
+    now = time.time()
+    db = _connect()
+    try:
+        with db:
+            cur = db.execute(
+                "INSERT INTO leases VALUES (?, ?, ?) ON CONFLICT (name) DO UPDATE "
+                "SET holder = excluded.holder, expires = excluded.expires "
+                "WHERE leases.holder = excluded.holder OR leases.expires < ?",
+                (name, HOLDER, now + seconds, now))
+            return cur.rowcount == 1
+    finally:
+        db.close()
+
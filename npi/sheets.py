@@ -0,0 +1,101 @@
+import pandas as pd
+
+from npi import schema
+from npi.dates import parse_dates
+
+# --------------------- SHEET PARSERS ---------------------
+# Each parser takes the raw CSV bytes (as a file-like object) and returns the
+# typed frame every page expects. Shared by all pages through npi.sources.
+#
+# Only the columns the trackers use are read. Low-cardinality fields (owner,
+# category, status, milestone type) are categorical, dates the trackers
+# compare are parsed to datetimes, and missing values stay missing: the "—" /
+# "NA" placeholders are applied at display time (render_table's na_rep,
+# format_dates, the CSV exports).
+#
+# The optional columns argument is the tracker's column mapping from
+# npi.sites; without it the defaults / header rules below are used. name is
+# the tracker id, for reporting header changes (npi.schema.watch).
+
+
+def read_readiness(buf, columns=None, name=None):
+    header = pd.read_csv(buf, nrows=0).columns
+    buf.seek(0)
+    cols = schema.resolve(header, READINESS_RULES, columns)
+    schema.watch(name, header, cols)
+    keep = list(dict.fromkeys(c for c in cols.values() if c))
+    categorical = {c: "category" for c in (cols["category"], cols["owner"], cols["status"]) if c}
+    df = pd.read_csv(buf, usecols=keep, dtype=categorical)[keep]
+    df = df.dropna(how='all').reset_index(drop=True)
+    if cols["target"]:
+        df[cols["target"]] = parse_dates(df[cols["target"]])
+    return df
+
+
+MILESTONE_COLUMNS = ["Task", "Milestone_Type", "Plan_Date", "Actual_Date"]
+
+
+def read_milestone(buf, columns=None, name=None):
+    # columns: sheet positions of task, type, plan and actual (default 0-3).
+    # Plan / actual dates stay text here: year-less "dd-Mon" values get their
+    # year when the snapshot is classified (npi.dates, cached per value).
+    positions = list(columns or range(len(MILESTONE_COLUMNS)))
+    header = pd.read_csv(buf, nrows=0).columns
+    buf.seek(0)
+    schema.watch(name, header, {c: header[p] if p < len(header) else None
+                                for c, p in zip(MILESTONE_COLUMNS, positions)})
+    df = pd.read_csv(buf, header=None, skiprows=1, usecols=positions, dtype=str)[positions]
+    df.columns = MILESTONE_COLUMNS
+    df["Milestone_Type"] = df["Milestone_Type"].astype("category")
+    return df
+
+
+DALLAS_COLUMNS = ["Sub-Milestones", "Plan", "CWV", "CW", "Actual", "Remarks", "Lead time"]
+
+
+def read_dallas(buf, columns=None, name=None):
+    # columns: the headers to show, in order (default DALLAS_COLUMNS)
+    columns = columns or DALLAS_COLUMNS
+    df = pd.read_csv(buf, usecols=lambda c: c.strip() in columns, dtype=str)
+    # Clean column names
+    df.columns = df.columns.str.strip()
+    schema.watch(name, df.columns, {c: c if c in df.columns else None for c in columns})
+    df = df.loc[:, ~df.columns.duplicated()]
+    # Whitespace-only cells count as empty
+    for col in df.columns:
+        df[col] = df[col].mask(df[col].str.strip() == "")
+    # Missing columns come back empty, in the exact order
+    return df.reindex(columns=columns)
+
+
+# Header rules for the readiness roles (see npi.schema); the category falls
+# back to the first column
+READINESS_RULES = {
+    "category": {"match": r"\bprocess category\b", "fallback": 0},
+    "sub": {"match": r"^sub\b|\bsub[ _-]?process\b"},
+    "owner": {"match": r"\bowner\b"},
+    "target": {"match": r"\btarget\b"},
+    "status": {"match": r"\bstatus\b"},
+    "remark": {"match": r"\bremarks?\b"},
+}
+
+
+def readiness_columns(df, columns=None):
+    # role -> header of the readiness sheet, cached per distinct header;
+    # columns (role -> header) overrides the rules
+    return schema.resolve(df.columns, READINESS_RULES, columns)
+
+
+# Row keys used to diff consecutive snapshots (see npi.diff)
+def readiness_keys(df, columns=None):
+    cols = readiness_columns(df, columns)
+    return [c for c in (cols["category"], cols["sub"]) if c]
+
+
+def milestone_keys(df, columns=None):
+    return ["Task", "Milestone_Type"]
+
+
+def dallas_keys(df, columns=None):
+    # The first shown column names the sub-milestone
+    return [df.columns[0]]
@@ -0,0 +1,63 @@
+# --------------------- SITES & TRACKERS ---------------------
+# Every tracker shown by the dashboard, in home-page order. npi.trackers does
+# the fetch / classify and npi.engine the rendering for all of them; a page in
+# pages/ only names its tracker id. Adding an NA site is an entry here plus a two-line page file.
+#
+#   type      readiness | milestone | submilestones (see npi.trackers.TYPES)
+#   url       published Google Sheets CSV (or a file:// CSV / Parquet, see
+#             npi.backends); trackers sharing a url share one source, so one
+#             fetch per refresh window serves all of them. They must have the
+#             same type and columns (the source parses the sheet once);
+#             npi.sources.get_source raises otherwise
+#   refresh   seconds between refreshes
+#   timeout   optional, seconds the overview waits for this sheet (default
+#             npi.trackers.OVERVIEW_TIMEOUT)
+#   columns   optional column mapping, passed to the type's parser:
+#               readiness      {role: header}, roles category / sub / owner /
+#                              target / status / remark (default: the header
+#                              rules in npi.sheets.READINESS_RULES)
+#               milestone      positions of task, type, plan, actual (0-3)
+#               submilestones  headers to show, in order; must include
+#                              "Plan" and "Actual" (default DALLAS_COLUMNS)
+#   title / site / button / page / colors / export / table: presentation
+
+READINESS_URL = "https://docs.google.com/spreadsheets/d/e/2PACX-1vT3so_mMFyNEBJGBZuEYzTxaWDMSJg0nGznK4ln9r4i2OTRzL_AxATf8sSBgwEdfA/pub?gid=1714107674&single=true&output=csv"
+MILESTONE_URL = "https://docs.google.com/spreadsheets/d/e/2PACX-1vSERW8jK8wY8-01wqcDBtNY_g8Km2g3QyxNjT1BWIg2II95wvouLQ1wsgWckkY56Q/pub?gid=1960938483&single=true&output=csv"
+DALLAS_URL = "https://docs.google.com/spreadsheets/d/e/2PACX-1vRtFXzX7qmZ2yyJPqnr8h_llta3uvIFnVsI0cwUWGMoZuJXPQ9c4Blm-WTFLVABWA/pub?gid=1934231119&single=true&output=csv"
+
+TRACKERS = {
+    "utah": {
+        "type": "readiness",
+        "site": "UTAH NA",
+        "url": READINESS_URL,
+        "refresh": 30,
+        "title": "UTAH NA",
+        "button": "📋 UTAH NA ",
+        "page": "pages/1_UTAH_NA.py",
+        "colors": ("#1d4ed8", "#3b82f6"),
+        "export": "process_readiness.csv",
+    },
+    "milestone": {
+        "type": "milestone",
+        "site": "UTAH NA",
+        "url": MILESTONE_URL,
+        "refresh": 30,
+        "title": "📋 Milestone Tracker Dashboard",
+        "button": "🎯 Milestone Tracker Dashboard",
+        "page": "pages/2_Milestone_Tracker.py",
+        "colors": ("#059669", "#10b981"),
+        "export": "milestone_data.csv",
+    },
+    "dallas": {
+        "type": "submilestones",
+        "site": "DALLAS NA",
+        "url": DALLAS_URL,
+        "refresh": 300,
+        "title": "📋 DALLAS NA ",
+        "button": " 📋 DALLAS NA ",
+        "page": "pages/3_DALLAS_NA.py",
+        "colors": ("#059669", "#10b981"),
+        "export": "sub_milestones_data.csv",
+        "table": "big-font-table",
+    },
+}
@@ -0,0 +1,356 @@
+import hashlib
+import io
+import logging
+import random
+import threading
+import time
+
+from npi import metrics, shared
+from npi.backends import fetch
+from npi.diff import diff_frames, row_keys
+from npi.disk import current, load_meta, load_snapshot, save_snapshot, touch_snapshot
+
+log = logging.getLogger(__name__)
+
+# --------------------- SHARED SHEET SOURCES ---------------------
+# One Source per URL for the whole process. Every session and every page asks
+# the same Source, so a refresh window costs exactly one download no matter how
+# many displays are open. Callers get the same parsed snapshot back and must
+# treat snapshot.df as read-only (copy before adding columns).
+#
+# Bytes come from npi.backends (published-sheet HTTP, local files, or the mock
+# server), chosen by the URL scheme.
+#
+# Refreshes are conditional: the previous ETag / Last-Modified are sent back,
+# and the raw bytes are hashed. When the sheet has not changed (a 304, or the
+# same digest) the existing snapshot is kept, including everything derived
+# from it, and only its fetch time moves forward.
+#
+# Sources registered with row keys also record how each new snapshot differs
+# from the one it replaced (snapshot.diff, see npi.diff).
+#
+# Every new snapshot is also persisted (npi.disk). After a restart the
+# persisted one is served straight away while a background refresh runs,
+# unless it was parsed under another spec or frame version; then it is
+# dropped and the sheet fetched again.
+# Expired snapshots are served the same way (stale-while-revalidate), so after
+# the first load no page waits on the network. A failed refresh keeps serving
+# the last good snapshot (source.last_error says why, snapshot.fetched_at how
+# old it is) and retries with jittered exponential backoff instead of raising.
+# A source with nothing loaded yet backs off the same way, raising the stored
+# error until its retry time.
+#
+# With the shared cache tier on (npi.shared), replicas adopt the snapshot the
+# lease-holding replica persisted instead of each fetching the sheet.
+#
+# Listeners (source.subscribe) run after every successful refresh, changed or
+# not; npi.history uses this to append snapshots to the trend store.
+#
+# Fetch / parse times, bytes downloaded and hit / miss / unchanged / error
+# counts go to npi.metrics under the source name (the tracker id from
+# npi.sites, or the parser name minus read_).
+
+MAX_BACKOFF = 600
+
+
+class Following(Exception):
+    # Another replica holds the lease and is refreshing this source
+    pass
+
+
+class Snapshot:
+    def __init__(self, df, fetched_at, version, digest, etag=None, last_modified=None):
+        self.df = df
+        self.fetched_at = fetched_at
+        self.version = version
+        self.digest = digest
+        self.etag = etag
+        self.last_modified = last_modified
+        self.keys = None
+        self.diff = None
+        self.from_disk = False
+        self._derived = {}
+        self._derived_lock = threading.Lock()
+
+    def derive(self, key, fn):
+        # Memoize work computed from this snapshot (classified frames, indexes,
+        # ...). It lives as long as the content does, so unchanged refreshes
+        # never redo it. Tuple keys are (name, day, ...): deriving a name for a
+        # new day drops its entries for earlier days, so a sheet that never
+        # changes does not collect one classified copy per day.
+        name = key[0] if isinstance(key, tuple) else key
+        try:
+            value = self._derived[key]
+        except KeyError:
+            pass
+        else:
+            metrics.incr("derive_hit", name)
+            return value
+        with self._derived_lock:
+            if key not in self._derived:
+                metrics.incr("derive_miss", name)
+                if isinstance(key, tuple):
+                    self._drop_earlier(key)
+                self._derived[key] = fn(self.df)
+            return self._derived[key]
+
+    def _drop_earlier(self, key):
+        name, day, rest = key[0], key[1], key[2:]
+        for k in list(self._derived):
+            if isinstance(k, tuple) and k[0] == name and k[2:] == rest and k[1] < day:
+                del self._derived[k]
+
+
+class Source:
+    def __init__(self, url, parse, ttl, keys=None, name=None, spec=None):
+        self.url = url
+        self.parse = parse
+        self.name = name or parse.__name__.replace("read_", "")
+        self.ttl = ttl
+        self.keys = keys
+        self.spec = spec
+        self.snapshot = None
+        self.last_error = None
+        self.failures = 0
+        self.flights = 0          # refresh attempts finished, for single flight
+        self.listeners = {}
+        self._next_refresh = 0
+        self._warm = False
+        self._background = False
+        self._background_lock = threading.Lock()
+        self._lock = threading.Lock()
+
+    def subscribe(self, name, fn):
+        # fn(source, snapshot) after each successful refresh; one per name
+        self.listeners.setdefault(name, fn)
+
+    def expire(self):
+        # Make the next get() refresh, as if the refresh window had run out
+        self._next_refresh = 0
+
+    def _fresh(self):
+        return self.snapshot is not None and time.time() < self._next_refresh
+
+    @property
+    def next_refresh(self):
+        return self._next_refresh
+
+    def get(self, wait=False):
+        # Stale-while-revalidate: once anything is loaded, an expired snapshot
+        # is returned straight away and one background refresh publishes the
+        # next version. Only the very first load (or wait=True, for headless
+        # callers that want the fresh data) blocks on the network.
+        if self._fresh():
+            metrics.incr("source_hit", self.name)
+            return self.snapshot
+        metrics.incr("source_miss", self.name)
+        if not self._warm:
+            self._warm_start()
+        snap = self.snapshot
+        if snap is None and self.last_error is not None and time.time() < self._next_refresh:
+            # A cold source that failed is backing off too
+            raise self.last_error
+        if snap is not None and not wait:
+            metrics.incr("source_stale", self.name)
+            self._refresh_in_background()
+            return snap
+        # Single flight: the first caller fetches, everyone else waits on the
+        # lock and then takes that flight's outcome: the snapshot it published,
+        # or, when it failed with nothing to serve, its error.
+        flight = self.flights
+        with self._lock:
+            if self._fresh():
+                return self.snapshot
+            if self.flights != flight:
+                if self.snapshot is None:
+                    raise self.last_error
+                return self.snapshot
+            self._refresh_locked()
+            return self.snapshot
+
+    def _warm_start(self):
+        with self._lock:
+            if self._warm:
+                return
+            self._warm = True
+            if self.snapshot is not None:
+                return
+            loaded = load_snapshot(self.url)
+            if loaded is None:
+                return
+            df, meta = loaded
+            if not current(meta, self.spec):
+                log.info("dropping the persisted snapshot of %s: parsed under another spec or frame version",
+                         self.name)
+                return
+            snap = Snapshot(df, meta["fetched_at"], 1, meta["digest"], meta["etag"], meta["last_modified"])
+            snap.from_disk = True
+            if self.keys is not None:
+                snap.keys = row_keys(df, self.keys(df))
+            self.snapshot = snap
+
+    def _refresh_in_background(self):
+        with self._background_lock:
+            if self._background:
+                return
+            self._background = True
+
+        def run():
+            try:
+                with self._lock:
+                    # A refresh that finished while this one was starting
+                    # already did the work
+                    if not self._fresh():
+                        self._refresh_locked()
+            finally:
+                self._background = False
+
+        threading.Thread(target=run, name=f"refresh {self.url[-40:]}", daemon=True).start()
+
+    def _refresh_locked(self):
+        try:
+            self._attempt()
+        finally:
+            self.flights += 1
+
+    def _attempt(self):
+        snap = self.snapshot
+        try:
+            new = self._refresh(snap)
+        except Following:
+            # Another replica is fetching; keep serving what we have and look
+            # for its copy again shortly
+            self._next_refresh = time.time() + shared.POLL
+            return
+        except Exception as e:
+            # Retry after a backoff, serving the last good snapshot meanwhile;
+            # with nothing to serve, the error is raised until the retry time
+            self.failures += 1
+            delay = self._backoff()
+            log.warning("refresh failed for %s (%d in a row, retry in %.0fs): %s",
+                        self.url, self.failures, delay, e)
+            metrics.incr("source_error", self.name)
+            self.last_error = e
+            self._next_refresh = time.time() + delay
+            if snap is None:
+                raise
+            snap.from_disk = False
+            return
+        self.last_error = None
+        self.failures = 0
+        self._next_refresh = time.time() + self.ttl
+        self.snapshot = new
+        for name, fn in list(self.listeners.items()):
+            try:
+                fn(self, new)
+            except Exception:
+                log.exception("listener %s failed for %s", name, self.url)
+
+    def _backoff(self):
+        # Doubles with each consecutive failure up to MAX_BACKOFF; the jitter
+        # keeps sources (and replicas) from retrying in lockstep
+        delay = min(self.ttl * 2 ** (self.failures - 1), MAX_BACKOFF)
+        return random.uniform(delay / 2, delay)
+
+    def _refresh(self, snap):
+        if shared.ENABLED:
+            adopted = self._follow(snap)
+            if adopted is not None:
+                return adopted
+        with metrics.timer("fetch", self.name):
+            if snap is None:
+                raw, etag, last_modified = fetch(self.url)
+            else:
+                raw, etag, last_modified = fetch(self.url, snap.etag, snap.last_modified)
+        metrics.incr("fetch_bytes", self.name, len(raw) if raw is not None else 0)
+        digest = hashlib.sha256(raw).hexdigest() if raw is not None else None
+        if snap is not None and (raw is None or digest == snap.digest):
+            snap.fetched_at = time.time()
+            snap.etag, snap.last_modified = etag, last_modified
+            snap.from_disk = False
+            metrics.incr("source_unchanged", self.name)
+            if shared.ENABLED:
+                touch_snapshot(self.url, snap, self.spec)
+            return snap
+        with metrics.timer("parse", self.name):
+            df = self.parse(io.BytesIO(raw))
+        new = self._next(snap, df, time.time(), digest, etag, last_modified)
+        save_snapshot(self.url, new, self.spec)
+        return new
+
+    def _next(self, snap, df, fetched_at, digest, etag, last_modified):
+        version = snap.version + 1 if snap else 1
+        new = Snapshot(df, fetched_at, version, digest, etag, last_modified)
+        if self.keys is not None:
+            new.keys = row_keys(df, self.keys(df))
+            if snap is not None and snap.keys is not None:
+                new.diff = diff_frames(snap.df, snap.keys, df, new.keys)
+        return new
+
+    # --------------------- SHARED CACHE TIER ---------------------
+    def _follow(self, snap):
+        # The snapshot another replica published, or None when this process
+        # holds the lease and should fetch. Raises Following while another
+        # replica is fetching and there is something to keep serving; a cold
+        # process waits for the copy instead, at most one lease term.
+        deadline = time.time() + self.ttl + shared.LEASE_GRACE
+        while True:
+            meta = load_meta(self.url)
+            if (meta is not None and current(meta, self.spec) and time.time() - meta["fetched_at"] < self.ttl
+                    and (snap is None or snap.from_disk or meta["fetched_at"] > snap.fetched_at)):
+                adopted = self._adopt(snap, meta)
+                if adopted is not None:
+                    return adopted
+            if shared.lead(self.url, self.ttl + shared.LEASE_GRACE):
+                metrics.incr("shared_lead", self.name)
+                return None
+            if snap is not None:
+                metrics.incr("shared_follow", self.name)
+                raise Following()
+            if time.time() > deadline:
+                return None
+            time.sleep(shared.POLL)
+
+    def _adopt(self, snap, meta):
+        if snap is not None and meta["digest"] == snap.digest:
+            snap.fetched_at = meta["fetched_at"]
+            snap.etag, snap.last_modified = meta["etag"], meta["last_modified"]
+            snap.from_disk = False
+            metrics.incr("source_unchanged", self.name)
+            return snap
+        with metrics.timer("load", self.name):
+            loaded = load_snapshot(self.url)
+        if loaded is None:
+            return None
+        df, meta = loaded
+        if not current(meta, self.spec):
+            return None
+        metrics.incr("shared_adopt", self.name)
+        return self._next(snap, df, meta["fetched_at"], meta["digest"], meta["etag"], meta["last_modified"])
+
+_registry = {}
+_registry_lock = threading.Lock()
+
+
+def get_source(url, parse, ttl, keys=None, name=None, spec=None):
+    # spec: what parse / keys are configured with (e.g. tracker type and
+    # column mapping). The first caller's parser serves everyone, so a caller
+    # sharing the url with a different spec is an error, not a silent swap.
+    with _registry_lock:
+        src = _registry.get(url)
+        if src is None:
+            src = _registry[url] = Source(url, parse, ttl, keys, name, spec)
+        else:
+            if src.spec != spec:
+                raise ValueError(f"{url} is already read by {src.name} as {src.spec!r}, "
+                                 f"{name or 'this caller'} asks for {spec!r}")
+            src.keys = src.keys or keys
+            # Pages may ask for the same sheet with different intervals; the
+            # shared source refreshes as often as the most eager one.
+            src.ttl = min(src.ttl, ttl)
+        return src
+
+
+def all_sources():
+    with _registry_lock:
+        return list(_registry.values())
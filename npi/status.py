@@ -0,0 +1,131 @@
+import numpy as np
+import pandas as pd
+
+from npi import metrics
+from npi.dates import parse_day_month
+from npi.index import FilterIndex
+from npi.sheets import readiness_columns
+
+# --------------------- STATUS CLASSIFICATION ---------------------
+# Column-wise status rules shared by every tracker. Each classifier returns a
+# categorical status Series and the group counts used by the metric cards,
+# both from a single pass over the masks.
+
+# Readiness (process readiness / UTAH NA)
+DELAYED = "NOT CLOSED – DELAYED!"
+OPEN = "Open"
+CLOSED_LATE = "Closed (Late)"
+CLOSED_ON_TIME = "Closed On Time"
+READINESS_STATUSES = [DELAYED, OPEN, CLOSED_LATE, CLOSED_ON_TIME]
+READINESS_GROUPS = {
+    "delayed": [DELAYED],
+    "open": [OPEN],
+    "closed": [CLOSED_LATE, CLOSED_ON_TIME],
+}
+CLOSED_WORDS = ["closed", "close", "done"]
+# "View" selectbox option -> status group (None = everything)
+READINESS_VIEWS = {"All Items": None, "Only Delayed": "delayed", "Only Open": "open", "Only Closed": "closed"}
+
+# Milestones
+OVERDUE = "Overdue (No Actual)"
+MS_DELAYED = "Delayed"
+PENDING = "Pending"
+COMPLETED = "Completed On Time"
+MILESTONE_STATUSES = [OVERDUE, MS_DELAYED, PENDING, COMPLETED]
+MILESTONE_GROUPS = {
+    "delayed": [OVERDUE, MS_DELAYED],
+    "pending": [PENDING],
+    "completed": [COMPLETED],
+}
+MILESTONE_VIEWS = {"All": None, "Overdue / Delayed": "delayed", "Pending": "pending",
+                   "Completed On Time": "completed"}
+
+
+def _result(codes, labels, groups, index):
+    status = pd.Series(pd.Categorical.from_codes(codes, categories=labels), index=index)
+    per_label = dict(zip(labels, np.bincount(codes, minlength=len(labels)).tolist()))
+    counts = {g: sum(per_label[l] for l in members) for g, members in groups.items()}
+    return status, counts
+
+
+def classify_readiness(status, target, today):
+    # status: raw status text (or None); target: datetime Series (or None)
+    index = status.index if status is not None else target.index
+    n = len(index)
+    if status is not None and isinstance(status.dtype, pd.CategoricalDtype):
+        # Match the distinct categories only, then broadcast through the codes
+        words = status.cat.categories.astype(str).str.strip().str.lower().isin(CLOSED_WORDS)
+        closed = np.append(words, False)[status.cat.codes.to_numpy()]
+    elif status is not None:
+        closed = status.astype(str).str.strip().str.lower().isin(CLOSED_WORDS).to_numpy()
+    else:
+        closed = np.zeros(n, dtype=bool)
+    if target is not None:
+        # NaT compares False, so missing targets are never overdue
+        overdue = (target.dt.normalize() < today).to_numpy()
+    else:
+        overdue = np.zeros(n, dtype=bool)
+    codes = np.select(
+        [closed & ~overdue, closed & overdue, overdue],
+        [3, 2, 0],
+        default=1,
+    ).astype(np.int8)
+    return _result(codes, READINESS_STATUSES, READINESS_GROUPS, index)
+
+
+def classify_milestone(plan, actual, today):
+    # plan / actual: datetime Series
+    has_actual = actual.notna().to_numpy()
+    has_plan = plan.notna().to_numpy()
+    on_time = has_actual & has_plan & (actual <= plan).to_numpy()
+    overdue = ~has_actual & has_plan & (plan < today).to_numpy()
+    codes = np.select(
+        [on_time, has_actual, overdue],
+        [3, 1, 0],
+        default=2,
+    ).astype(np.int8)
+    return _result(codes, MILESTONE_STATUSES, MILESTONE_GROUPS, plan.index)
+
+
+def in_group(status, groups, group):
+    return status.isin(groups[group])
+
+
+def group_of(status, groups):
+    return status.map({label: g for g, labels in groups.items() for label in labels}).astype(str)
+
+
+def prepare_readiness(df, today, columns=None):
+    # Copy of the shared snapshot with "Final Status" added. Meant to run
+    # through Snapshot.derive, keyed by the day.
+    with metrics.timer("classify"):
+        cols = readiness_columns(df, columns)
+        df = df.copy()
+        target = df[cols["target"]] if cols["target"] else None
+        status = df[cols["status"]] if cols["status"] else None
+        if status is None and target is None:
+            status = pd.Series("", index=df.index)
+        df["Final Status"], counts = classify_readiness(status, target, today)
+    return df, cols, counts
+
+
+def prepare_milestone(df, today):
+    # Copy of the shared snapshot with real dates and "Status" added
+    df = df.copy()
+    with metrics.timer("dates"):
+        df['Plan_Date'] = parse_day_month(df['Plan_Date'], today.year)
+        df['Actual_Date'] = parse_day_month(df['Actual_Date'], today.year)
+    with metrics.timer("classify"):
+        df['Status'], counts = classify_milestone(df['Plan_Date'], df['Actual_Date'], today)
+    return df, counts
+
+
+def readiness_index(df, cols):
+    dims = {"group": group_of(df["Final Status"], READINESS_GROUPS), "category": df[cols["category"]]}
+    if cols["owner"]:
+        dims["owner"] = df[cols["owner"]]
+    return FilterIndex(dims)
+
+
+def milestone_index(df):
+    return FilterIndex({"type": df["Milestone_Type"], "group": group_of(df["Status"], MILESTONE_GROUPS)})
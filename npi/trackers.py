@@ -0,0 +1,144 @@
+import functools
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from npi import history
+from npi.backends import locate
+from npi.search import text_index
+from npi.sheets import (dallas_keys, milestone_keys, read_dallas, read_milestone, read_readiness, readiness_columns,
+                        readiness_keys)
+from npi.sites import TRACKERS
+from npi.sources import get_source
+from npi.status import prepare_milestone, prepare_readiness
+
+# --------------------- TRACKER DATA ---------------------
+# Everything about a tracker except drawing it: its shared source (parser, row
+# keys and history recording configured from the tracker's column mapping),
+# concurrent fetching, the classified frames, text search and the health
+# counts. No Streamlit here, so the pages (npi.engine, npi.overview) and the
+# headless tools (npi.alerts, npi.report) run the very same loading and status
+# logic.
+
+FETCH_WORKERS = 8
+OVERVIEW_TIMEOUT = 20
+
+# Shared by every session; a fetch that outlives its timeout keeps running
+# here and still publishes into its source for the next run
+_pool = ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix="npi-fetch")
+
+
+def _configured(fn, columns):
+    return functools.partial(fn, columns=columns) if columns else fn
+
+
+def source_for(tracker_id):
+    t = TRACKERS[tracker_id]
+    kind = TYPES[t["type"]]
+    columns = t.get("columns")
+    parse = functools.partial(_configured(kind["parse"], columns), name=tracker_id)
+    # Trackers may share a sheet only when they read it the same way
+    source = get_source(locate(tracker_id, t["url"]), parse, t["refresh"],
+                        keys=_configured(kind["keys"], columns), name=tracker_id, spec=(t["type"], columns))
+    history.track(source, tracker_id, _configured(kind["summary"], columns))
+    return source
+
+
+def fetch_all(tracker_ids=None, wait_fresh=False, timeout=None):
+    # Get every tracker's snapshot concurrently. Yields (tracker_id, snapshot,
+    # error, seconds) as each source answers, so callers can draw partial
+    # results; total latency is the slowest fetch, not the sum. A source that
+    # misses its timeout (timeout, else tracker "timeout", else
+    # OVERVIEW_TIMEOUT) is yielded with a TimeoutError. wait_fresh: block for
+    # fresh data instead of serving an expired or saved snapshot.
+    tracker_ids = list(tracker_ids or TRACKERS)
+    start = time.monotonic()
+    futures = {_pool.submit(source_for(tid).get, wait_fresh): tid for tid in tracker_ids}
+    deadlines = {f: start + (timeout or TRACKERS[tid].get("timeout", OVERVIEW_TIMEOUT)) for f, tid in futures.items()}
+    pending = set(futures)
+    while pending:
+        done, _ = wait(pending, timeout=max(0, min(deadlines[f] for f in pending) - time.monotonic()),
+                       return_when=FIRST_COMPLETED)
+        now = time.monotonic()
+        for f in done:
+            error = f.exception()
+            yield futures[f], None if error else f.result(), error, now - start
+        expired = {f for f in pending - done if deadlines[f] <= now}
+        for f in expired:
+            yield futures[f], None, TimeoutError(f"no answer after {now - start:.0f}s"), now - start
+        pending -= done | expired
+
+
+# --------------------- CLASSIFIED FRAMES ---------------------
+# Derived once per snapshot and day, shared by pages, overview and reports
+
+READINESS_SHOWN = ("category", "sub", "owner", "target", "status", "remark")
+MILESTONE_SHOWN = ["Task", "Milestone_Type", "Plan_Date", "Actual_Date", "Status"]
+MILESTONE_DATES = ["Plan_Date", "Actual_Date"]
+
+
+def readiness_frame(t, snap, today):
+    # (classified frame, column roles, counts)
+    return snap.derive(("readiness", today), lambda d: prepare_readiness(d, today, t.get("columns")))
+
+
+def milestone_frame(t, snap, today):
+    # (classified frame, counts)
+    return snap.derive(("milestone", today), lambda d: prepare_milestone(d, today))
+
+
+def readiness_table(df, cols):
+    # The columns a readiness table shows, in order
+    shown = [cols[c] for c in READINESS_SHOWN] + ["Final Status"]
+    return df[[c for c in dict.fromkeys(shown) if c and c in df.columns]]
+
+
+def search_index(tracker_id, snap):
+    # Full-text index over the tracker's free-text columns (npi.search)
+    t = TRACKERS[tracker_id]
+    return snap.derive("search", lambda d: text_index(tracker_id, snap, TYPES[t["type"]]["search"](t, d)))
+
+
+def _readiness_search(t, df):
+    cols = readiness_columns(df, t.get("columns"))
+    return [c for c in dict.fromkeys((cols["category"], cols["sub"], cols["remark"])) if c]
+
+
+def _milestone_search(t, df):
+    return ["Task"]
+
+
+def _submilestone_search(t, df):
+    # The sub-milestone name column and the remarks
+    return [c for c in dict.fromkeys((df.columns[0], "Remarks")) if c in df.columns]
+
+
+# Health counts: {"delayed", "open", "closed"}, None where the tracker has no
+# such notion
+
+def _readiness_counts(t, snap, today):
+    return readiness_frame(t, snap, today)[2]
+
+
+def _milestone_counts(t, snap, today):
+    counts = milestone_frame(t, snap, today)[1]
+    return {"delayed": counts["delayed"], "open": counts["pending"], "closed": counts["completed"]}
+
+
+def _submilestone_counts(t, snap, today):
+    done = int(snap.df["Actual"].notna().sum())
+    return {"delayed": None, "open": len(snap.df) - done, "closed": done}
+
+
+TYPES = {
+    "readiness": {"parse": read_readiness, "keys": readiness_keys, "summary": history.readiness_summary,
+                  "counts": _readiness_counts, "search": _readiness_search, "na_rep": "—"},
+    "milestone": {"parse": read_milestone, "keys": milestone_keys, "summary": history.milestone_summary,
+                  "counts": _milestone_counts, "search": _milestone_search, "na_rep": "—"},
+    "submilestones": {"parse": read_dallas, "keys": dallas_keys, "summary": history.dallas_summary,
+                      "counts": _submilestone_counts, "search": _submilestone_search, "na_rep": "NA"},
+}
+
+
+def counts_for(tracker_id, snap, today):
+    t = TRACKERS[tracker_id]
+    return TYPES[t["type"]]["counts"](t, snap, today)
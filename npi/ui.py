@@ -0,0 +1,162 @@
+import math
+import time
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+from npi import history, metrics
+
+try:
+    from streamlit.elements.widgets.button import DownloadButtonDataType
+    DEFERRED_DOWNLOADS = "Callable" in str(DownloadButtonDataType)
+except ImportError:
+    DEFERRED_DOWNLOADS = False
+
+# --------------------- TABLE WINDOW ---------------------
+# Sort + pagination controls for the tracker tables. Sorting and filtering are
+# applied to the whole frame, then only the visible page is handed to the
+# renderer, so render cost and payload follow the page size, not the sheet.
+# Each page repeats its group label on the first row (render_table blanks
+# repeats only within the slice), so a page never opens on a blank group cell.
+
+PAGE_SIZES = [50, 100, 250, 500]
+
+
+def _sort(df, col, descending):
+    try:
+        return df.sort_values(col, ascending=not descending, kind="stable")
+    except TypeError:
+        # Mixed text / numbers in a sheet column: fall back to text order
+        return df.sort_values(col, ascending=not descending, kind="stable", key=lambda s: s.astype(str))
+
+
+def search_box(key):
+    # Free-text query for npi.search ("" when empty)
+    return st.text_input("🔎 Search", key=f"{key}_search",
+                         placeholder="Words or the start of words; every term must match").strip()
+
+
+def table_window(df, key, default_size=100):
+    c1, c2, c3, c4 = st.columns([3, 1, 1, 1])
+    with c1:
+        sort_col = st.selectbox("Sort by", ["Sheet order"] + list(df.columns), key=f"{key}_sort")
+    with c2:
+        descending = st.toggle("Descending", key=f"{key}_desc")
+    with c3:
+        size = st.selectbox("Rows per page", PAGE_SIZES, index=PAGE_SIZES.index(default_size), key=f"{key}_size")
+
+    pages = max(1, math.ceil(len(df) / size))
+    page_key = f"{key}_page"
+    # Filters can shrink the frame under a page the session is already on
+    if st.session_state.get(page_key, 1) > pages:
+        st.session_state[page_key] = pages
+    with c4:
+        page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, step=1, key=page_key)
+
+    if sort_col != "Sheet order":
+        df = _sort(df, sort_col, descending)
+    start = (page - 1) * size
+    window = df.iloc[start:start + size]
+    if len(df):
+        st.caption(f"Rows {start + 1:,}–{start + len(window):,} of {len(df):,}")
+    return window
+
+
+# --------------------- CHANGE SUMMARY ---------------------
+CHANGES_SHOWN = 50
+
+
+def _describe(key):
+    return key.replace("\x1f", " / ")
+
+
+def change_summary(snap):
+    diff = snap.diff
+    if not diff:
+        return
+    title = (f"🔄 What changed in the last refresh: {len(diff.added)} added, "
+             f"{len(diff.changed)} changed, {len(diff.removed)} removed")
+    if diff.columns_changed:
+        title += f"; columns {len(diff.columns_added)} added, {len(diff.columns_removed)} removed"
+    with st.expander(title):
+        lines = [f"➕ column {c}" for c in diff.columns_added]
+        lines += [f"➖ column {c}" for c in diff.columns_removed]
+        lines += [f"➕ {_describe(snap.keys[l])}" for l in diff.added[:CHANGES_SHOWN]]
+        lines += [f"✏️ {_describe(snap.keys[l])}: {', '.join(map(str, cols))}"
+                  for l, cols in list(diff.changed.items())[:CHANGES_SHOWN]]
+        lines += [f"➖ {_describe(k)}" for k in diff.removed[:CHANGES_SHOWN]]
+        st.text("\n".join(lines))
+
+
+# --------------------- DOWNLOADS ---------------------
+# make_data() only runs when the user downloads. Streamlit versions that take
+# a callable for data defer it themselves; older ones need the bytes up front,
+# so the button first asks to prepare the file.
+def lazy_download(label, make_data, file_name, key, mime="text/csv"):
+    if DEFERRED_DOWNLOADS:
+        st.download_button(label, make_data, file_name, mime, key=key)
+        return
+    prepared = f"{key}_prepared"
+    if not st.session_state.get(prepared):
+        if st.button(label, key=f"{key}_prepare"):
+            st.session_state[prepared] = True
+            st.rerun()
+        return
+    if st.download_button(f"{label} (ready)", make_data(), file_name, mime, key=key):
+        st.session_state[prepared] = False
+
+
+# --------------------- DATA FRESHNESS ---------------------
+def stale_notice(source, snap):
+    as_of = datetime.fromtimestamp(snap.fetched_at).strftime('%d-%b-%Y %H:%M:%S')
+    if snap.from_disk:
+        st.info(f"Showing saved data from {as_of} while the sheet refreshes.")
+    elif source.last_error is not None:
+        retry = max(0, source.next_refresh - time.time())
+        st.warning(f"Could not reach the sheet ({source.last_error}). Showing data as of {as_of}; "
+                   f"retrying in {retry:.0f}s.")
+
+
+# --------------------- HISTORY ---------------------
+def trend_panel(name, group, title, days=90):
+    with st.expander(f"📈 {title} (last {days} days)"):
+        counts = history.daily_counts(name, group, days)
+        if counts.empty:
+            st.caption("No history recorded yet.")
+        else:
+            st.line_chart(counts)
+
+
+def slip_panel(name):
+    with st.expander("🕒 Plan date / status history"):
+        events = history.row_events(name)
+        if events.empty:
+            st.caption("No changes recorded yet.")
+            return
+        keys = sorted(events["key"].unique())
+        key = st.selectbox("Item", keys, format_func=_describe, key=f"{name}_slip")
+        rows = events[events["key"] == key].drop(columns="key")
+        st.dataframe(rows, hide_index=True, use_container_width=True)
+
+
+# --------------------- DEBUG PANEL ---------------------
+# Closes the page timing and publishes metrics (throttled) on every run; the
+# panel itself only shows with ?debug=1 in the URL or NPI_DEBUG=1.
+def debug_panel():
+    metrics.page_done()
+    metrics.publish()
+    if not (metrics.DEBUG or st.query_params.get("debug") not in (None, "", "0")):
+        return
+    snap = metrics.snapshot()
+    with st.sidebar.expander("🛠 Debug metrics", expanded=True):
+        st.caption(f"Active sessions: {snap['active_sessions']} · pid {snap['pid']}")
+        if snap["stages"]:
+            stages = pd.DataFrame(snap["stages"])
+            for c in ("mean_s", "p50_s", "p95_s", "max_s"):
+                stages[c.replace("_s", "_ms")] = (stages[c] * 1000).round(1)
+            st.dataframe(stages[["stage", "label", "count", "mean_ms", "p50_ms", "p95_ms", "max_ms"]],
+                         hide_index=True, use_container_width=True)
+        if snap["counters"]:
+            st.dataframe(pd.DataFrame(snap["counters"]), hide_index=True, use_container_width=True)
+        st.download_button("metrics.prom", metrics.prometheus(snap), "metrics.prom", "text/plain")
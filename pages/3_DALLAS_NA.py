@@ -0,0 +1,7 @@
+from npi.engine import run
+
+def main():
+    run("dallas")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+from npi.overview import run
+
+def main():
+    run()
+
+if __name__ == "__main__":
+    main()